@@ -0,0 +1,16 @@
+from .micro_batcher import EmbeddingMicroBatcher
+from .planner import EmbeddingBatchPlanner
+from ..config import settings
+
+# Shared instances that can be imported by the routes
+embedding_batcher = EmbeddingMicroBatcher(
+    window_ms=settings.embedding_microbatch_window_ms,
+    max_batch_size=settings.embedding_microbatch_max_size,
+)
+
+embedding_planner = EmbeddingBatchPlanner(
+    default_max_batch_size=settings.embedding_batch_max_size,
+    default_max_tokens=settings.embedding_batch_max_tokens,
+    default_max_concurrency=settings.embedding_batch_max_concurrency,
+    max_retries=settings.embedding_batch_max_retries,
+)
@@ -0,0 +1,163 @@
+import asyncio
+import json
+import logging
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from opentelemetry import trace
+
+from ..providers.base import EmbeddingProvider
+from ..schemas import EmbeddingResponse
+from .planner import estimate_tokens
+
+log = logging.getLogger(__name__)
+tracer = trace.get_tracer(__name__)
+
+
+def split_usage(usage: Dict[str, Any], weights: List[int]) -> List[Dict[str, Any]]:
+    """
+    Split batch-level usage counters across callers in proportion to
+    `weights`. Each caller gets the difference of the rounded cumulative
+    totals, so the shares always add up to the reported value.
+    """
+    total_weight = sum(weights) or 1
+    shares: List[Dict[str, Any]] = [{} for _ in weights]
+    for name, value in usage.items():
+        if not isinstance(value, int):
+            continue
+        cumulative = previous = 0
+        for share, weight in zip(shares, weights):
+            cumulative += weight
+            boundary = value * cumulative // total_weight
+            share[name] = boundary - previous
+            previous = boundary
+    return shares
+
+
+class _PendingBatch:
+    """Texts and caller futures queued for one (provider, model, options) group."""
+
+    def __init__(
+        self,
+        provider: EmbeddingProvider,
+        provider_name: str,
+        model: str,
+        options: Dict[str, Any],
+    ):
+        self.provider = provider
+        self.provider_name = provider_name
+        self.model = model
+        self.options = options
+        self.texts: List[str] = []
+        self.futures: List[asyncio.Future] = []
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+class EmbeddingMicroBatcher:
+    """
+    Coalesces concurrent single-text embedding requests for the same
+    (provider, model, options) into one upstream call.
+
+    A batch is flushed when `max_batch_size` texts are queued or `window_ms`
+    after the first text arrived, whichever comes first. Every caller gets
+    back an EmbeddingResponse containing only its own vector.
+    """
+
+    def __init__(self, window_ms: float = 5.0, max_batch_size: int = 32):
+        self.window = window_ms / 1000.0
+        self.max_batch_size = max(1, max_batch_size)
+        self._pending: Dict[Tuple[str, str, str], _PendingBatch] = {}
+        # Keep references so in-flight flush tasks are not garbage collected.
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def embed(
+        self,
+        provider: EmbeddingProvider,
+        provider_name: str,
+        model: str,
+        options: Dict[str, Any],
+        text: str,
+    ) -> EmbeddingResponse:
+        group = (provider_name, model, json.dumps(options or {}, sort_keys=True))
+        batch = self._pending.get(group)
+        if batch is None:
+            batch = _PendingBatch(
+                provider=provider,
+                provider_name=provider_name,
+                model=model,
+                options=options,
+            )
+            self._pending[group] = batch
+            batch.timer = asyncio.get_running_loop().call_later(
+                self.window, self._flush, group
+            )
+
+        future = asyncio.get_running_loop().create_future()
+        batch.texts.append(text)
+        batch.futures.append(future)
+
+        if len(batch.texts) >= self.max_batch_size:
+            self._flush(group)
+
+        return await future
+
+    def _flush(self, group: Tuple[str, str, str]) -> None:
+        batch = self._pending.pop(group, None)
+        if batch is None:
+            return
+        if batch.timer is not None:
+            batch.timer.cancel()
+        task = asyncio.create_task(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: _PendingBatch) -> None:
+        with tracer.start_as_current_span("embedding_micro_batch") as span:
+            span.set_attribute("provider", batch.provider_name)
+            span.set_attribute("model", batch.model)
+            span.set_attribute("batch_size", len(batch.texts))
+
+            try:
+                response = await batch.provider.generate_embeddings_async(
+                    input_text=batch.texts, model=batch.model, options=batch.options
+                )
+            except Exception as e:
+                span.set_attribute("error", True)
+                span.record_exception(e)
+                for future in batch.futures:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+
+            log.debug(
+                "Micro-batch flushed",
+                extra={
+                    "provider": batch.provider_name,
+                    "model": batch.model,
+                    "batch_size": len(batch.texts),
+                },
+            )
+
+            by_index = {item["index"]: item["embedding"] for item in response.data}
+            # Usage is reported for the whole batch; split it by each
+            # caller's share of the input.
+            shares = split_usage(
+                response.usage or {}, [estimate_tokens(t) for t in batch.texts]
+            )
+            for i, future in enumerate(batch.futures):
+                if future.done():
+                    continue
+                if i not in by_index:
+                    future.set_exception(
+                        ValueError(f"Provider returned no embedding for batch index {i}")
+                    )
+                    continue
+                future.set_result(
+                    EmbeddingResponse(
+                        provider=response.provider,
+                        model=response.model,
+                        data=[
+                            {"object": "embedding", "embedding": by_index[i], "index": 0}
+                        ],
+                        usage=shares[i],
+                    )
+                )
@@ -0,0 +1,158 @@
+import asyncio
+import logging
+import math
+from typing import Any, Dict, List
+
+from opentelemetry import trace
+
+from ..providers.base import EmbeddingProvider
+from ..providers.errors import ProviderError
+from ..schemas import EmbeddingResponse
+
+log = logging.getLogger(__name__)
+tracer = trace.get_tracer(__name__)
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token) used for batch sizing."""
+    return max(1, math.ceil(len(text) / 4))
+
+
+class EmbeddingBatchPlanner:
+    """
+    Splits an embedding request into sub-batches that respect a provider's
+    limits (inputs per call, tokens per call, concurrent calls), runs them
+    with bounded parallelism, retries sub-batches that failed transiently
+    (timeouts, connection errors, 429, 5xx) on their own and reassembles the
+    results in input order.
+
+    Limits come from the model's `capabilities` block in config/models.yaml
+    and fall back to the defaults given here.
+    """
+
+    def __init__(
+        self,
+        default_max_batch_size: int = 64,
+        default_max_tokens: int = 32768,
+        default_max_concurrency: int = 4,
+        max_retries: int = 2,
+        retry_backoff: float = 0.5,
+    ):
+        self.defaults = {
+            "maxBatchSize": default_max_batch_size,
+            "maxTokensPerRequest": default_max_tokens,
+            "maxConcurrency": default_max_concurrency,
+        }
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+
+    def limits(self, capabilities: Dict[str, Any]) -> Dict[str, int]:
+        merged = {**self.defaults, **(capabilities or {})}
+        return {name: max(1, int(merged[name])) for name in self.defaults}
+
+    def plan(self, texts: List[str], capabilities: Dict[str, Any]) -> List[List[int]]:
+        """
+        Group input indices into sub-batches. The number of batches is the
+        minimum the limits allow, and tokens are spread evenly across them
+        so one oversized batch does not dominate latency.
+        """
+        if not texts:
+            return []
+
+        limits = self.limits(capabilities)
+        max_batch = limits["maxBatchSize"]
+        max_tokens = limits["maxTokensPerRequest"]
+
+        tokens = [estimate_tokens(text) for text in texts]
+        batch_count = max(
+            math.ceil(len(texts) / max_batch), math.ceil(sum(tokens) / max_tokens)
+        )
+        target_tokens = math.ceil(sum(tokens) / batch_count)
+
+        batches: List[List[int]] = []
+        current: List[int] = []
+        current_tokens = 0
+        for i, count in enumerate(tokens):
+            if current and (
+                len(current) >= max_batch
+                or current_tokens + count > max_tokens
+                or current_tokens >= target_tokens
+            ):
+                batches.append(current)
+                current, current_tokens = [], 0
+            # A single text above the token limit still goes alone; the
+            # provider decides whether to truncate or reject it.
+            current.append(i)
+            current_tokens += count
+        if current:
+            batches.append(current)
+        return batches
+
+    async def embed(
+        self,
+        provider: EmbeddingProvider,
+        provider_name: str,
+        model: str,
+        texts: List[str],
+        options: Dict[str, Any],
+        capabilities: Dict[str, Any],
+    ) -> EmbeddingResponse:
+        batches = self.plan(texts, capabilities)
+        semaphore = asyncio.Semaphore(self.limits(capabilities)["maxConcurrency"])
+
+        async def run_batch(indices: List[int]) -> EmbeddingResponse:
+            batch_texts = [texts[i] for i in indices]
+            attempt = 0
+            while True:
+                try:
+                    async with semaphore:
+                        return await provider.generate_embeddings_async(
+                            input_text=batch_texts, model=model, options=options
+                        )
+                except ProviderError as e:
+                    # Only transient failures are retried; 4xx and bad
+                    # input would fail the same way again.
+                    if not e.retryable or attempt >= self.max_retries:
+                        raise
+                    delay = self.retry_backoff * (2**attempt)
+                    attempt += 1
+                    log.warning(
+                        "Embedding sub-batch failed, retrying",
+                        extra={
+                            "provider": provider_name,
+                            "model": model,
+                            "batch_size": len(indices),
+                            "attempt": attempt,
+                            "error": str(e),
+                        },
+                    )
+                    await asyncio.sleep(delay)
+
+        with tracer.start_as_current_span("embedding_batch_plan") as span:
+            span.set_attribute("provider", provider_name)
+            span.set_attribute("model", model)
+            span.set_attribute("input_count", len(texts))
+            span.set_attribute("batch_count", len(batches))
+
+            if len(batches) == 1:
+                return await run_batch(batches[0])
+
+            responses = await asyncio.gather(*(run_batch(b) for b in batches))
+
+            data: List[Dict[str, Any]] = []
+            usage: Dict[str, int] = {}
+            response_model = model
+            for indices, response in zip(batches, responses):
+                for item in response.data:
+                    data.append({**item, "index": indices[item["index"]]})
+                for name, value in (response.usage or {}).items():
+                    usage[name] = usage.get(name, 0) + value
+                response_model = response.model or response_model
+            data.sort(key=lambda item: item["index"])
+
+            return EmbeddingResponse(
+                provider=provider_name,
+                model=response_model,
+                data=data,
+                usage=usage,
+            )
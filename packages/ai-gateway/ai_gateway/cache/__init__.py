@@ -0,0 +1,41 @@
+from .compaction import HistorySummaryCache
+from .completion import CompletionCache
+from .embedding import EmbeddingCache
+from .rerank import RerankScoreCache
+from .semantic import SemanticCompletionCache
+from .singleflight import SingleFlight
+from ..config import settings
+
+# Shared instances that can be imported by the routes
+embedding_cache = EmbeddingCache(
+    memory_entries=settings.embedding_cache_memory_entries,
+    disk_path=settings.embedding_cache_path or None,
+    disk_max_entries=settings.embedding_cache_disk_max_entries,
+    enabled=settings.embedding_cache_enabled,
+)
+
+rerank_cache = RerankScoreCache(
+    max_entries=settings.rerank_cache_max_entries,
+    ttl_seconds=settings.rerank_cache_ttl_seconds,
+    enabled=settings.rerank_cache_enabled,
+)
+
+completion_cache = CompletionCache(
+    max_entries=settings.chat_cache_max_entries,
+    ttl_seconds=settings.chat_cache_ttl_seconds,
+    enabled=settings.chat_cache_enabled,
+)
+
+semantic_cache = SemanticCompletionCache(
+    max_entries=settings.chat_semantic_cache_max_entries,
+    ttl_seconds=settings.chat_semantic_cache_ttl_seconds,
+    enabled=settings.chat_semantic_cache_enabled,
+)
+
+history_summary_cache = HistorySummaryCache(
+    max_entries=settings.chat_compaction_cache_max_entries,
+    ttl_seconds=settings.chat_compaction_cache_ttl_seconds,
+    enabled=settings.chat_compaction_cache_enabled,
+)
+
+single_flight = SingleFlight(enabled=settings.single_flight_enabled)
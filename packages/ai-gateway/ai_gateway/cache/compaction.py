@@ -0,0 +1,64 @@
+import hashlib
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from .lru import LRUCache
+
+
+class HistorySummaryCache:
+    """
+    Rolling conversation summaries keyed by a digest of the history prefix
+    they replace. Clients resend the full history every turn, so once a
+    prefix has been summarized every later turn finds the same key.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: Optional[float] = 86400.0,
+        enabled: bool = True,
+    ):
+        self.enabled = enabled
+        self._summaries = LRUCache(max_entries, ttl_seconds)
+
+    @staticmethod
+    def prefix_keys(messages: List[Dict[str, Any]]) -> List[str]:
+        """
+        keys[i] is the digest of messages[:i], computed incrementally so
+        every prefix of a long history costs one pass.
+        """
+        digest = hashlib.sha256()
+        keys = [digest.hexdigest()]
+        for message in messages:
+            payload = json.dumps(
+                message,
+                sort_keys=True,
+                ensure_ascii=False,
+                separators=(",", ":"),
+                default=str,
+            )
+            digest.update(payload.encode("utf-8"))
+            digest.update(b"\x1e")
+            keys.append(digest.hexdigest())
+        return keys
+
+    def latest(
+        self, keys: List[str], positions: List[int]
+    ) -> Optional[Tuple[int, str]]:
+        """(position, summary) for the longest cached prefix among `positions`."""
+        if not self.enabled:
+            return None
+        for position in sorted(positions, reverse=True):
+            if self._summaries.peek(keys[position]) is not None:
+                return position, self._summaries.get(keys[position])
+        # Count the lookup once, not once per candidate prefix.
+        self._summaries.stats["misses"] += 1
+        return None
+
+    def put(self, key: str, summary: str) -> None:
+        if not self.enabled:
+            return
+        self._summaries.set(key, summary)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"enabled": self.enabled, **self._summaries.get_stats()}
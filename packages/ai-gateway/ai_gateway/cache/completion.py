@@ -0,0 +1,72 @@
+import copy
+import hashlib
+import json
+from typing import Any, Dict, List, Optional
+
+from .lru import LRUCache
+
+
+class CompletionCache:
+    """
+    Exact-match cache of non-streaming chat completion responses.
+
+    Keys are SHA-256 digests of everything that determines the output
+    (prompt id and version, fully rendered messages, provider, model,
+    options, tools and reasoning settings), so two requests only share an
+    entry when the upstream call would be byte-for-byte identical.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 2048,
+        ttl_seconds: Optional[float] = 3600.0,
+        enabled: bool = True,
+    ):
+        self.enabled = enabled
+        self._responses = LRUCache(max_entries, ttl_seconds)
+
+    @staticmethod
+    def make_key(
+        prompt_type: Optional[str],
+        prompt_version: Optional[str],
+        messages: List[Dict[str, Any]],
+        provider: Optional[str],
+        model: Optional[str],
+        options: Dict[str, Any],
+        tools: Optional[List[Dict[str, Any]]] = None,
+        tool_choice: Any = None,
+        reasoning: Any = None,
+    ) -> str:
+        payload = json.dumps(
+            [
+                prompt_type,
+                prompt_version,
+                messages,
+                provider,
+                model,
+                options,
+                tools,
+                tool_choice,
+                reasoning,
+            ],
+            sort_keys=True,
+            ensure_ascii=False,
+            separators=(",", ":"),
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        if not self.enabled:
+            return None
+        response = self._responses.get(key)
+        # Callers may mutate the response they get back.
+        return copy.deepcopy(response) if response is not None else None
+
+    def put(self, key: str, response: Dict[str, Any]) -> None:
+        if not self.enabled:
+            return
+        self._responses.set(key, copy.deepcopy(response))
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"enabled": self.enabled, **self._responses.get_stats()}
@@ -0,0 +1,228 @@
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+log = logging.getLogger(__name__)
+
+# SQLite caps the number of bound parameters per statement.
+_SQLITE_BATCH = 500
+
+
+class EmbeddingCache:
+    """
+    Content-addressed embedding cache with two tiers:
+
+    - an in-process LRU of float32 arrays (bounded by entry count)
+    - an optional SQLite store of float32 blobs that survives restarts
+
+    Keys are SHA-256 digests of (provider, model, options, text), so the same
+    text embedded with different settings never collides.
+    """
+
+    def __init__(
+        self,
+        memory_entries: int = 10_000,
+        disk_path: Optional[str] = None,
+        disk_max_entries: int = 1_000_000,
+        enabled: bool = True,
+    ):
+        self.enabled = enabled
+        self.memory_entries = memory_entries
+        self.disk_max_entries = disk_max_entries
+        self._memory: "OrderedDict[str, array]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        # Row count of the disk tier, kept in step with inserts and evictions
+        # so writes never have to scan the table.
+        self._disk_count = 0
+        self.stats: Dict[str, int] = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "memory_evictions": 0,
+            "disk_evictions": 0,
+        }
+
+        if enabled and disk_path:
+            self._open_disk(Path(disk_path))
+
+    def _open_disk(self, path: Path) -> None:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(path), check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                " key TEXT PRIMARY KEY,"
+                " vector BLOB NOT NULL,"
+                " accessed_at REAL NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS embeddings_accessed_at"
+                " ON embeddings (accessed_at)"
+            )
+            self._db.commit()
+            (self._disk_count,) = self._db.execute(
+                "SELECT COUNT(*) FROM embeddings"
+            ).fetchone()
+            log.info(
+                "Embedding disk cache opened",
+                extra={"path": str(path), "entries": self._disk_count},
+            )
+        except sqlite3.Error as e:
+            log.error(
+                "Embedding disk cache unavailable",
+                extra={"path": str(path), "error": str(e)},
+            )
+            self._db = None
+
+    @staticmethod
+    def make_key(provider: str, model: str, options: Dict[str, Any], text: str) -> str:
+        payload = json.dumps(
+            [provider, model, options or {}, text],
+            sort_keys=True,
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    # --- Memory tier ---
+
+    def _memory_get(self, key: str) -> Optional[array]:
+        vector = self._memory.get(key)
+        if vector is not None:
+            self._memory.move_to_end(key)
+        return vector
+
+    def _memory_put(self, key: str, vector: array) -> None:
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+            self.stats["memory_evictions"] += 1
+
+    # --- Disk tier ---
+
+    def _disk_get_many(self, keys: Sequence[str]) -> Dict[str, array]:
+        found: Dict[str, array] = {}
+        if self._db is None or not keys:
+            return found
+        now = time.time()
+        with self._lock:
+            for start in range(0, len(keys), _SQLITE_BATCH):
+                batch = keys[start : start + _SQLITE_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._db.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                    batch,
+                ).fetchall()
+                for key, blob in rows:
+                    vector = array("f")
+                    vector.frombytes(blob)
+                    found[key] = vector
+                if rows:
+                    self._db.executemany(
+                        "UPDATE embeddings SET accessed_at = ? WHERE key = ?",
+                        [(now, key) for key, _ in rows],
+                    )
+            self._db.commit()
+        return found
+
+    def _disk_put_many(self, items: Dict[str, array]) -> None:
+        if self._db is None or not items:
+            return
+        now = time.time()
+        with self._lock:
+            inserted = self._db.executemany(
+                "INSERT OR IGNORE INTO embeddings (key, vector, accessed_at)"
+                " VALUES (?, ?, ?)",
+                [(key, vector.tobytes(), now) for key, vector in items.items()],
+            ).rowcount
+            if inserted < len(items):
+                # Keys already on disk hold the same content; just touch them.
+                self._db.executemany(
+                    "UPDATE embeddings SET accessed_at = ? WHERE key = ?",
+                    [(now, key) for key in items],
+                )
+            self._disk_count += inserted
+            overflow = self._disk_count - self.disk_max_entries
+            if overflow > 0:
+                evicted = self._db.execute(
+                    "DELETE FROM embeddings WHERE key IN ("
+                    " SELECT key FROM embeddings ORDER BY accessed_at LIMIT ?)",
+                    (overflow,),
+                ).rowcount
+                self._disk_count -= evicted
+                self.stats["disk_evictions"] += evicted
+            self._db.commit()
+
+    # --- Public API ---
+
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, List[float]]:
+        """
+        Look up keys in memory first, then on disk. Disk hits are promoted
+        to the memory tier. Returns only the keys that were found.
+        """
+        if not self.enabled:
+            return {}
+
+        found: Dict[str, array] = {}
+        disk_lookup: List[str] = []
+        for key in dict.fromkeys(keys):
+            vector = self._memory_get(key)
+            if vector is not None:
+                found[key] = vector
+                self.stats["memory_hits"] += 1
+            else:
+                disk_lookup.append(key)
+
+        if disk_lookup and self._db is not None:
+            try:
+                disk_found = await asyncio.to_thread(self._disk_get_many, disk_lookup)
+            except sqlite3.Error as e:
+                log.warning("Embedding disk cache read failed", extra={"error": str(e)})
+                disk_found = {}
+            for key, vector in disk_found.items():
+                self._memory_put(key, vector)
+                found[key] = vector
+            self.stats["disk_hits"] += len(disk_found)
+            self.stats["misses"] += len(disk_lookup) - len(disk_found)
+        else:
+            self.stats["misses"] += len(disk_lookup)
+
+        return {key: vector.tolist() for key, vector in found.items()}
+
+    async def put_many(self, items: Dict[str, List[float]]) -> None:
+        """Store freshly computed vectors in both tiers."""
+        if not self.enabled or not items:
+            return
+
+        packed = {key: array("f", vector) for key, vector in items.items()}
+        for key, vector in packed.items():
+            self._memory_put(key, vector)
+
+        if self._db is not None:
+            try:
+                await asyncio.to_thread(self._disk_put_many, packed)
+            except sqlite3.Error as e:
+                log.warning(
+                    "Embedding disk cache write failed", extra={"error": str(e)}
+                )
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "memory_entries": len(self._memory),
+            "memory_capacity": self.memory_entries,
+            "disk_enabled": self._db is not None,
+            "disk_entries": self._disk_count,
+            **self.stats,
+        }
@@ -0,0 +1,50 @@
+import hashlib
+from typing import Any, Dict, List, Optional
+
+from .lru import LRUCache
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class RerankScoreCache:
+    """
+    Caches cross-encoder relevance scores per (model, query, document).
+    Query and document are stored as SHA-256 digests, so memory use does
+    not grow with document length.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 50_000,
+        ttl_seconds: Optional[float] = None,
+        enabled: bool = True,
+    ):
+        self.enabled = enabled
+        self._scores = LRUCache(max_entries, ttl_seconds)
+
+    def get_many(
+        self, model: str, query: str, documents: List[str]
+    ) -> Dict[int, float]:
+        """Return {document index: score} for every cached document."""
+        if not self.enabled:
+            return {}
+        query_digest = _digest(query)
+        found: Dict[int, float] = {}
+        for i, document in enumerate(documents):
+            score = self._scores.get((model, query_digest, _digest(document)))
+            if score is not None:
+                found[i] = score
+        return found
+
+    def put_many(self, model: str, query: str, scores: Dict[str, float]) -> None:
+        """Store {document text: score} for one query."""
+        if not self.enabled:
+            return
+        query_digest = _digest(query)
+        for document, score in scores.items():
+            self._scores.set((model, query_digest, _digest(document)), score)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"enabled": self.enabled, **self._scores.get_stats()}
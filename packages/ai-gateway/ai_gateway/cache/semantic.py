@@ -0,0 +1,102 @@
+import copy
+import math
+import operator
+import time
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+
+def _normalize(vector: Sequence[float]) -> array:
+    norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+    return array("f", (x / norm for x in vector))
+
+
+class SemanticCompletionCache:
+    """
+    Near-duplicate cache of chat completions. Each partition (one prompt
+    with fixed model/options/tools) holds a small LRU index of prompt
+    embeddings; a lookup returns the stored completion of the most similar
+    prompt when its cosine similarity reaches the caller's threshold.
+
+    The index is a brute-force scan over unit vectors, which is cheap for
+    the few hundred recent prompts kept per partition.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 512,
+        ttl_seconds: Optional[float] = 3600.0,
+        enabled: bool = True,
+    ):
+        self.enabled = enabled
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        # partition -> {entry id: (expires_at, unit vector, response)}
+        self._partitions: Dict[str, OrderedDict] = {}
+        self._next_id = 0
+        self.stats: Dict[str, int] = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+        }
+
+    def lookup(
+        self, partition: str, vector: Sequence[float], threshold: float
+    ) -> Optional[Tuple[Dict[str, Any], float]]:
+        """Return (cached response, similarity) for the best match, or None."""
+        if not self.enabled:
+            return None
+        entries = self._partitions.get(partition)
+        if not entries:
+            self.stats["misses"] += 1
+            return None
+
+        query = _normalize(vector)
+        now = time.monotonic()
+        best_id, best_score = None, -1.0
+        for entry_id, (expires_at, stored, _) in list(entries.items()):
+            if expires_at and expires_at < now:
+                del entries[entry_id]
+                self.stats["expirations"] += 1
+                continue
+            if len(stored) != len(query):
+                continue
+            score = sum(map(operator.mul, stored, query))
+            if score > best_score:
+                best_id, best_score = entry_id, score
+
+        if best_id is None or best_score < threshold:
+            self.stats["misses"] += 1
+            return None
+        entries.move_to_end(best_id)
+        self.stats["hits"] += 1
+        return copy.deepcopy(entries[best_id][2]), best_score
+
+    def put(
+        self, partition: str, vector: Sequence[float], response: Dict[str, Any]
+    ) -> None:
+        if not self.enabled:
+            return
+        entries = self._partitions.setdefault(partition, OrderedDict())
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else 0.0
+        entries[self._next_id] = (
+            expires_at,
+            _normalize(vector),
+            copy.deepcopy(response),
+        )
+        self._next_id += 1
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "partitions": len(self._partitions),
+            "entries": sum(len(e) for e in self._partitions.values()),
+            "capacity_per_partition": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            **self.stats,
+        }
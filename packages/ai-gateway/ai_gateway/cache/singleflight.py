@@ -0,0 +1,198 @@
+import asyncio
+import hashlib
+import json
+import logging
+from collections import defaultdict
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    TypeVar,
+)
+
+log = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class _Broadcast:
+    """
+    Chunks of one upstream stream, buffered so subscribers that join late
+    still receive the stream from its first chunk.
+    """
+
+    def __init__(self):
+        self.chunks: List[Any] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.subscribers = 0
+        self.task: Optional[asyncio.Task] = None
+        self._changed = asyncio.Event()
+
+    def notify(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def subscribe(self) -> AsyncIterator[Any]:
+        index = 0
+        while True:
+            if index < len(self.chunks):
+                yield self.chunks[index]
+                index += 1
+                continue
+            if self.done:
+                if self.error is not None:
+                    raise self.error
+                return
+            await self._changed.wait()
+
+
+class SingleFlight:
+    """
+    Collapses concurrent identical requests onto one upstream call. The
+    first caller for a key starts the call; callers that arrive while it
+    is in flight wait for it and receive the same result or exception.
+    Keys are only shared while a call is in flight, so this adds no
+    staleness on top of the caches.
+
+    The call runs in its own task, so a caller that disconnects does not
+    cancel it for the others. Results are shared, so callers must not
+    mutate them.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._calls: Dict[str, asyncio.Future] = {}
+        self._streams: Dict[str, _Broadcast] = {}
+        self._stats: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"calls": 0, "shared": 0}
+        )
+
+    @staticmethod
+    def make_key(namespace: str, *parts: Any) -> str:
+        payload = json.dumps(
+            parts,
+            sort_keys=True,
+            ensure_ascii=False,
+            separators=(",", ":"),
+            default=str,
+        )
+        return f"{namespace}:" + hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _namespace(key: str) -> str:
+        return key.split(":", 1)[0]
+
+    def in_flight(self, key: Optional[str]) -> bool:
+        return key is not None and (key in self._calls or key in self._streams)
+
+    async def do(self, key: Optional[str], fn: Callable[[], Awaitable[T]]) -> T:
+        """Result of `fn()`, shared with concurrent callers using `key`."""
+        if not self.enabled or key is None:
+            return await fn()
+
+        stats = self._stats[self._namespace(key)]
+        stats["calls"] += 1
+        future = self._calls.get(key)
+        if future is not None and not future.done():
+            stats["shared"] += 1
+        else:
+            future = asyncio.ensure_future(fn())
+            self._calls[key] = future
+            future.add_done_callback(lambda _: self._calls.pop(key, None))
+        # Shielded: one waiter being cancelled must not cancel the call.
+        return await asyncio.shield(future)
+
+    async def stream(
+        self, key: Optional[str], factory: Callable[[], AsyncIterator[Any]]
+    ) -> AsyncIterator[Any]:
+        """
+        Fans one upstream stream out to every concurrent subscriber with the
+        same key. The upstream is consumed by a background task and closed
+        early only if every subscriber goes away.
+        """
+        if not self.enabled or key is None:
+            async for chunk in factory():
+                yield chunk
+            return
+
+        stats = self._stats[self._namespace(key)]
+        stats["calls"] += 1
+        broadcast = self._streams.get(key)
+        if broadcast is not None and not broadcast.done:
+            stats["shared"] += 1
+        else:
+            broadcast = _Broadcast()
+            self._streams[key] = broadcast
+            broadcast.task = asyncio.ensure_future(
+                self._pump(key, broadcast, factory)
+            )
+
+        broadcast.subscribers += 1
+        try:
+            async for chunk in broadcast.subscribe():
+                yield chunk
+        finally:
+            broadcast.subscribers -= 1
+            if broadcast.subscribers == 0 and not broadcast.done:
+                log.info(
+                    "All stream subscribers left, closing upstream",
+                    extra={"key": key},
+                )
+                # Unregister before cancelling so a request arriving while
+                # the upstream closes starts its own call instead of joining.
+                self._forget(key, broadcast)
+                broadcast.task.cancel()
+
+    def _forget(self, key: str, broadcast: _Broadcast) -> None:
+        if self._streams.get(key) is broadcast:
+            del self._streams[key]
+
+    async def _pump(
+        self,
+        key: str,
+        broadcast: _Broadcast,
+        factory: Callable[[], AsyncIterator[Any]],
+    ) -> None:
+        iterator = factory()
+        try:
+            async for chunk in iterator:
+                broadcast.chunks.append(chunk)
+                broadcast.notify()
+        except asyncio.CancelledError:
+            broadcast.error = ConnectionAbortedError("Upstream stream was cancelled")
+        except Exception as e:
+            broadcast.error = e
+        finally:
+            # Unregister first: closing the upstream can await, and nobody
+            # may join a stream that has already ended or failed.
+            self._forget(key, broadcast)
+            aclose = getattr(iterator, "aclose", None)
+            if aclose is not None:
+                try:
+                    await aclose()
+                except Exception:
+                    pass
+            broadcast.done = True
+            broadcast.notify()
+
+    def get_stats(self, namespace: Optional[str] = None) -> Dict[str, Any]:
+        if namespace is not None:
+            return {
+                "enabled": self.enabled,
+                "in_flight": sum(
+                    1
+                    for key in (*self._calls, *self._streams)
+                    if self._namespace(key) == namespace
+                ),
+                **self._stats[namespace],
+            }
+        return {
+            "enabled": self.enabled,
+            "in_flight": len(self._calls) + len(self._streams),
+            "namespaces": {name: dict(stats) for name, stats in self._stats.items()},
+        }
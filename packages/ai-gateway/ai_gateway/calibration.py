@@ -0,0 +1,72 @@
+"""
+Measures int8 calibration ranges for an embedding model.
+
+    python -m ai_gateway.calibration --provider jina --model jina-clip-v2 samples.txt
+
+Embeds the sample texts (one per line), truncates and re-normalizes the
+vectors to every supported output size, and prints a `calibration.int8`
+block for config/models.yaml. Each size gets the [q, 1 - q] percentiles
+of all components (q = 0.0005 by default).
+"""
+
+import argparse
+from typing import Dict, List, Sequence
+
+from .models_registry import models_registry
+from .providers import get_embedding_provider
+from .vectors import truncate_and_normalize
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, round(q * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def measure_ranges(
+    vectors: List[List[float]], sizes: List[int], q: float
+) -> Dict[int, Dict[str, float]]:
+    ranges = {}
+    for size in sizes:
+        values = sorted(
+            x
+            for vector in vectors
+            for x in truncate_and_normalize(vector, size)
+        )
+        ranges[size] = {
+            "min": round(percentile(values, q), 4),
+            "max": round(percentile(values, 1.0 - q), 4),
+        }
+    return ranges
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--provider", required=True)
+    parser.add_argument("--model", required=True)
+    parser.add_argument("--quantile", type=float, default=0.0005)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("samples", help="Text file with one sample per line")
+    args = parser.parse_args()
+
+    with open(args.samples, "r") as f:
+        texts = [line.strip() for line in f if line.strip()]
+
+    provider = get_embedding_provider(args.provider)
+    vectors: List[List[float]] = []
+    for start in range(0, len(texts), args.batch_size):
+        response = provider.generate_embeddings(
+            texts[start : start + args.batch_size], args.model, {}
+        )
+        vectors.extend(item["embedding"] for item in response.data)
+
+    model = models_registry.get_model(args.provider, args.model) or {}
+    sizes = model.get("supportedDimensions") or [len(vectors[0])]
+    print(f"# {len(vectors)} samples, q = {args.quantile}")
+    print("calibration:")
+    print("  int8:")
+    for size, bounds in measure_ranges(vectors, sizes, args.quantile).items():
+        print(f"    {size}: {{min: {bounds['min']}, max: {bounds['max']}}}")
+
+
+if __name__ == "__main__":
+    main()
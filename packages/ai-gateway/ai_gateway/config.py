@@ -19,6 +19,93 @@ class Settings(BaseSettings):
 
     ollama_base_url: str = "http://localhost:11434/v1"
 
+    local_embedding_workers: Optional[int] = None  # defaults to the CPU count
+    local_embedding_model_dir: Optional[str] = None
+    local_embedding_dimensions: int = 1024
+
+    upstream_http2: bool = True
+    upstream_max_connections_per_host: int = 100
+    upstream_max_keepalive_per_host: int = 20
+    upstream_keepalive_expiry: float = 30.0
+    upstream_connect_timeout: float = 5.0
+    upstream_timeout: float = 60.0
+    # Chat completions can run for minutes (e.g. podcast scripts); the
+    # shared pool's timeout is sized for embedding and rerank calls.
+    chat_upstream_timeout: float = 600.0
+
+    ollama_embedding_batch_size: int = 64
+
+    embedding_cache_enabled: bool = True
+    embedding_cache_memory_entries: int = 10000
+    # Disk tier is opt-in: set an absolute path (EMBEDDING_CACHE_PATH) to
+    # persist embeddings across restarts.
+    embedding_cache_path: Optional[str] = None
+    embedding_cache_disk_max_entries: int = 1000000
+
+    rerank_cache_enabled: bool = True
+    rerank_cache_max_entries: int = 50000
+    rerank_cache_ttl_seconds: Optional[float] = 86400.0
+    rerank_batch_concurrency: int = 4
+    rerank_prefilter_enabled: bool = False
+    rerank_prefilter_min_documents: int = 64
+    rerank_prefilter_min_candidates: int = 32
+    rerank_prefilter_max_candidates: Optional[int] = None
+
+    # Auto provider routing (candidates per tier live in config/chat_routing.yaml)
+    routing_ewma_alpha: float = 0.2
+    routing_exploration_rate: float = 0.05
+    routing_prior_ttft_seconds: float = 1.0
+    routing_prior_tokens_per_second: float = 50.0
+    routing_reference_tokens: int = 256
+
+    # Merge content deltas into one SSE event per window; 0 sends every delta.
+    chat_stream_coalesce_ms: float = 0.0
+
+    chat_batch_max_requests: int = 64
+    chat_batch_provider_concurrency: int = 8
+
+    chat_cache_enabled: bool = True
+    chat_cache_max_entries: int = 2048
+    chat_cache_ttl_seconds: Optional[float] = 3600.0
+    # Semantic cache; prompts opt in with `meta.semantic_cache.threshold`.
+    chat_semantic_cache_enabled: bool = True
+    chat_semantic_cache_max_entries: int = 512
+    chat_semantic_cache_ttl_seconds: Optional[float] = 3600.0
+    chat_semantic_cache_provider: str = "jina"
+    chat_semantic_cache_model: str = "jina-clip-v2"
+    chat_semantic_cache_dimensions: Optional[int] = 256
+
+    # Context budgeting against config/chat_models.yaml; prompts declare
+    # their trimming policy in `meta.context_budget`.
+    chat_context_budget_enabled: bool = True
+
+    # History compaction for requests with `compact_history: true`: older
+    # turns are folded into a cached rolling summary by a cheap model.
+    chat_compaction_threshold_tokens: int = 8000
+    chat_compaction_keep_recent_tokens: int = 2000
+    chat_compaction_chunk_tokens: int = 12000
+    chat_compaction_provider: str = "auto"
+    chat_compaction_model: Optional[str] = None
+    chat_compaction_cache_enabled: bool = True
+    chat_compaction_cache_max_entries: int = 1024
+    chat_compaction_cache_ttl_seconds: Optional[float] = 86400.0
+
+    # Concurrent identical embedding, rerank and deterministic chat requests
+    # share one upstream call (and one upstream stream for SSE).
+    single_flight_enabled: bool = True
+
+    embedding_microbatch_enabled: bool = False
+    embedding_microbatch_window_ms: float = 5.0
+    embedding_microbatch_max_size: int = 32
+
+    embedding_batch_max_size: int = 64
+    embedding_batch_max_tokens: int = 32768
+    embedding_batch_max_concurrency: int = 4
+    embedding_batch_max_retries: int = 2
+
+    embedding_stream_batch_size: int = 64
+    embedding_stream_concurrency: int = 4
+
     posthog_api_key: Optional[str] = None
     posthog_host: str = "https://app.posthog.com"
 
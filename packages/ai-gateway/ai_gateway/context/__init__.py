@@ -0,0 +1,28 @@
+from pathlib import Path
+
+from .capabilities import ChatModelCapabilities
+from .compaction import HistoryCompactor
+from .tokenizer import get_token_counter
+from ..cache import history_summary_cache
+from ..config import settings
+
+# Shared instances that can be imported by the routes
+chat_model_capabilities = ChatModelCapabilities(
+    Path(__file__).parent.parent / "config" / "chat_models.yaml"
+)
+
+history_compactor = HistoryCompactor(
+    history_summary_cache,
+    threshold_tokens=settings.chat_compaction_threshold_tokens,
+    keep_recent_tokens=settings.chat_compaction_keep_recent_tokens,
+    chunk_tokens=settings.chat_compaction_chunk_tokens,
+)
+
+
+def preload_tokenizers() -> None:
+    """
+    Loads every encoding in the capability table so tiktoken's BPE files
+    are fetched at startup instead of on the first request.
+    """
+    for name in chat_model_capabilities.tokenizers():
+        get_token_counter(name)
@@ -0,0 +1,246 @@
+import logging
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..lexical import bm25_scores
+from .tokenizer import TokenCounter
+
+log = logging.getLogger(__name__)
+
+Messages = List[Dict[str, Any]]
+
+DROP_OLDEST = "drop_oldest"
+TRUNCATE_VARIABLE = "truncate_variable"
+RANK_BLOCKS = "rank_blocks"
+POLICIES = (DROP_OLDEST, TRUNCATE_VARIABLE, RANK_BLOCKS)
+
+# Re-render attempts for variable policies; the rendered prompt can differ
+# from the variable's own count by a few tokens at the boundaries.
+_MAX_RERENDERS = 3
+
+
+class ContextBudgetPolicy:
+    """
+    Trimming policy applied when a request does not fit the model's context
+    window, declared per prompt in the prompt YAML:
+
+        meta:
+          context_budget:
+            policy: rank_blocks          # drop_oldest | truncate_variable | rank_blocks
+            variable: context_content    # prompt variable to trim
+            block_separator: "\\n\\n"
+            block_start: "Source: "      # only split where a block starts
+            query_variables: [episode_title, focus]
+            keep: head                   # truncate_variable: head | tail
+            reserve_output_tokens: 2048
+
+    Prompts without a declaration (and plain message lists) use
+    `drop_oldest`. Whatever the policy, the oldest turns are dropped as a
+    last resort if the request still does not fit.
+    """
+
+    def __init__(
+        self,
+        policy: str = DROP_OLDEST,
+        variable: Optional[str] = None,
+        block_separator: str = "\n\n",
+        block_start: Optional[str] = None,
+        query_variables: Tuple[str, ...] = (),
+        keep: str = "head",
+        reserve_output_tokens: Optional[int] = None,
+    ):
+        if policy not in POLICIES:
+            log.warning(f"Unknown context budget policy '{policy}', dropping turns")
+            policy = DROP_OLDEST
+        if policy != DROP_OLDEST and not variable:
+            log.warning(f"Context budget policy '{policy}' has no variable, dropping turns")
+            policy = DROP_OLDEST
+        self.policy = policy
+        self.variable = variable
+        self.block_separator = block_separator
+        self.block_start = block_start
+        self.query_variables = tuple(query_variables)
+        self.keep = keep
+        self.reserve_output_tokens = reserve_output_tokens
+
+    @classmethod
+    def from_meta(cls, meta: Dict[str, Any]) -> "ContextBudgetPolicy":
+        config = meta.get("context_budget")
+        if not isinstance(config, dict):
+            return cls()
+        reserve = config.get("reserve_output_tokens")
+        return cls(
+            policy=config.get("policy", DROP_OLDEST),
+            variable=config.get("variable"),
+            block_separator=config.get("block_separator", "\n\n"),
+            block_start=config.get("block_start"),
+            query_variables=tuple(config.get("query_variables") or ()),
+            keep=config.get("keep", "head"),
+            reserve_output_tokens=int(reserve) if reserve is not None else None,
+        )
+
+    def split_blocks(self, text: str) -> List[str]:
+        if self.block_start:
+            pattern = "%s(?=%s)" % (
+                re.escape(self.block_separator),
+                re.escape(self.block_start),
+            )
+            return re.split(pattern, text)
+        return text.split(self.block_separator)
+
+
+class ContextBudget:
+    """
+    Fits a rendered request into `limit` prompt tokens. `render` re-renders
+    the full message list from modified prompt variables; without it (no
+    prompt_type) only turns can be dropped.
+    """
+
+    def __init__(
+        self,
+        counter: TokenCounter,
+        limit: int,
+        policy: ContextBudgetPolicy,
+        render: Optional[Callable[[Dict[str, Any]], Messages]] = None,
+        prompt_vars: Optional[Dict[str, Any]] = None,
+    ):
+        self.counter = counter
+        self.limit = limit
+        self.policy = policy
+        self.render = render
+        self.prompt_vars = prompt_vars or {}
+
+    def fit(self, messages: Messages) -> Tuple[Messages, Dict[str, Any]]:
+        """Returns the messages to send and a report of what was trimmed."""
+        original = self.counter.count_messages(messages)
+        report: Dict[str, Any] = {
+            "original_tokens": original,
+            "final_tokens": original,
+            "limit": self.limit,
+            "tokenizer": self.counter.name,
+            "policy": self.policy.policy,
+            "trimmed": False,
+        }
+        if original <= self.limit:
+            return messages, report
+
+        total = original
+        variable = self.policy.variable
+        if (
+            self.policy.policy != DROP_OLDEST
+            and self.render is not None
+            and isinstance(self.prompt_vars.get(variable), str)
+        ):
+            if self.policy.policy == RANK_BLOCKS:
+                messages, total, kept = self._rank_blocks(messages, total)
+                report["blocks_kept"] = kept
+            if total > self.limit:
+                messages, total = self._truncate_variable(messages, total)
+
+        if total > self.limit:
+            messages, total, dropped = self._drop_oldest(messages)
+            report["dropped_messages"] = dropped
+
+        report["final_tokens"] = total
+        report["trimmed"] = total < original
+        if total > self.limit:
+            log.warning(
+                "Request still exceeds the context budget after trimming",
+                extra={"tokens": total, "limit": self.limit},
+            )
+        return messages, report
+
+    def _rerender(self, value: str) -> Tuple[Messages, int]:
+        prompt_vars = dict(self.prompt_vars)
+        prompt_vars[self.policy.variable] = value
+        self.prompt_vars = prompt_vars
+        messages = self.render(prompt_vars)
+        return messages, self.counter.count_messages(messages)
+
+    def _truncate_variable(
+        self, messages: Messages, total: int
+    ) -> Tuple[Messages, int]:
+        """Cuts the variable by the overflow, re-rendering until it fits."""
+        text = self.prompt_vars[self.policy.variable]
+        for _ in range(_MAX_RERENDERS):
+            excess = total - self.limit
+            if excess <= 0 or not text:
+                break
+            text = self.counter.truncate(
+                text, self.counter.count(text) - excess, keep=self.policy.keep
+            )
+            messages, total = self._rerender(text)
+        return messages, total
+
+    def _rank_blocks(
+        self, messages: Messages, total: int
+    ) -> Tuple[Messages, int, int]:
+        """
+        Keeps the context blocks most relevant to the query variables (BM25)
+        that fit in the space left by the rest of the prompt, in their
+        original order.
+        """
+        text = self.prompt_vars[self.policy.variable]
+        blocks = self.policy.split_blocks(text)
+        available = self.limit - (total - self.counter.count(text))
+
+        query = " ".join(
+            str(self.prompt_vars[name])
+            for name in self.policy.query_variables
+            if self.prompt_vars.get(name)
+        )
+        scores = bm25_scores(query, blocks) if query else [0.0] * len(blocks)
+        separator_tokens = self.counter.count(self.policy.block_separator)
+
+        kept = []
+        used = 0
+        for index in sorted(range(len(blocks)), key=lambda i: (-scores[i], i)):
+            cost = self.counter.count(blocks[index])
+            if kept:
+                cost += separator_tokens
+            if used + cost <= available:
+                kept.append(index)
+                used += cost
+
+        if len(kept) == len(blocks):
+            return messages, total, len(kept)
+        if not kept:
+            # Nothing fits whole: keep the best block and let truncation cut it.
+            kept = [min(range(len(blocks)), key=lambda i: (-scores[i], i))]
+        value = self.policy.block_separator.join(blocks[i] for i in sorted(kept))
+        messages, total = self._rerender(value)
+        return messages, total, len(kept)
+
+    def _drop_oldest(self, messages: Messages) -> Tuple[Messages, int, int]:
+        """
+        Drops the oldest turns, never system messages or the final message.
+        An assistant tool call is dropped together with its tool results so
+        the remaining history stays well-formed.
+        """
+        # A trailing run of tool results stays with the call that produced it.
+        protected = len(messages) - 1
+        while protected > 0 and messages[protected].get("role") == "tool":
+            protected -= 1
+
+        turns: List[List[int]] = []
+        for index, message in enumerate(messages[:protected]):
+            if message.get("role") == "system":
+                continue
+            if message.get("role") == "tool" and turns and turns[-1][-1] == index - 1:
+                turns[-1].append(index)
+            else:
+                turns.append([index])
+
+        costs = [self.counter.count_message(m) for m in messages]
+        total = self.counter.count_messages(messages)
+        dropped = set()
+        for turn in turns:
+            if total <= self.limit:
+                break
+            dropped.update(turn)
+            total -= sum(costs[i] for i in turn)
+
+        if not dropped:
+            return messages, total, 0
+        kept = [m for i, m in enumerate(messages) if i not in dropped]
+        return kept, total, len(dropped)
@@ -0,0 +1,92 @@
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import yaml
+
+log = logging.getLogger(__name__)
+
+
+class ModelCapability:
+    """Context limits and tokenizer of one chat model."""
+
+    def __init__(
+        self,
+        context_window: int,
+        max_output_tokens: int,
+        tokenizer: Optional[str] = None,
+    ):
+        self.context_window = context_window
+        self.max_output_tokens = max_output_tokens
+        self.tokenizer = tokenizer
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "ModelCapability":
+        return cls(
+            context_window=int(config["contextWindow"]),
+            max_output_tokens=int(config["maxOutputTokens"]),
+            tokenizer=config.get("tokenizer"),
+        )
+
+
+class ChatModelCapabilities:
+    """
+    Model capability table from config/chat_models.yaml. Only listed models
+    are budgeted; `defaultTokenizer` is used to count tokens for the rest.
+    """
+
+    def __init__(self, config_path: Path):
+        self.default_tokenizer: Optional[str] = None
+        self.models: Dict[str, ModelCapability] = {}
+        self._load(config_path)
+
+    def _load(self, config_path: Path) -> None:
+        try:
+            with open(config_path, "r") as f:
+                config = yaml.safe_load(f) or {}
+        except FileNotFoundError:
+            log.warning(f"Chat model capabilities not found: {config_path}")
+            return
+        except yaml.YAMLError as e:
+            log.error(f"Error parsing chat model capabilities: {e}")
+            return
+
+        self.default_tokenizer = config.get("defaultTokenizer")
+        for entry in config.get("models") or []:
+            self.models[entry["model"]] = ModelCapability.from_config(entry)
+        log.info(
+            f"Loaded context capabilities for {len(self.models)} chat models from {config_path}"
+        )
+
+    def get(self, model: Optional[str]) -> Optional[ModelCapability]:
+        return self.models.get(model or "")
+
+    def resolve(self, models: Iterable[str]) -> Optional[ModelCapability]:
+        """
+        Effective capability when a request may be served by any of `models`
+        (e.g. the candidates of an auto-routed tier): the smallest context
+        window and output limit, counted with the first model's tokenizer.
+        None if any of them is not in the table, since its limits are unknown.
+        """
+        capabilities = [self.get(model) for model in models]
+        if not capabilities or any(c is None for c in capabilities):
+            return None
+        return ModelCapability(
+            context_window=min(c.context_window for c in capabilities),
+            max_output_tokens=min(c.max_output_tokens for c in capabilities),
+            tokenizer=capabilities[0].tokenizer,
+        )
+
+    def tokenizer_for(self, models: Iterable[str]) -> Optional[str]:
+        """Encoding to count tokens with, known model or not."""
+        capability = self.resolve(models)
+        if capability is not None and capability.tokenizer:
+            return capability.tokenizer
+        return self.default_tokenizer
+
+    def tokenizers(self) -> List[str]:
+        """Every encoding the table refers to, for preloading at startup."""
+        names = {c.tokenizer for c in self.models.values() if c.tokenizer}
+        if self.default_tokenizer:
+            names.add(self.default_tokenizer)
+        return sorted(names)
@@ -0,0 +1,116 @@
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from ..cache.compaction import HistorySummaryCache
+from .tokenizer import TokenCounter
+
+log = logging.getLogger(__name__)
+
+Messages = List[Dict[str, Any]]
+# (previous summary or None, turns to fold into it) -> new summary
+Summarizer = Callable[[Optional[str], Messages], Awaitable[str]]
+
+SUMMARY_PREFIX = "Summary of the earlier conversation:\n"
+
+
+def summary_message(summary: str) -> Dict[str, Any]:
+    return {"role": "system", "content": SUMMARY_PREFIX + summary}
+
+
+class HistoryCompactor:
+    """
+    Replaces the older part of a long conversation with a rolling summary.
+
+    Once the history (after any leading system messages) exceeds
+    `threshold_tokens`, the turns before the most recent
+    ~`keep_recent_tokens` are folded into a summary, at most
+    `chunk_tokens` of transcript per summarizer call. Each summary is
+    cached under the digest of the history prefix it covers, so later
+    turns start from the newest cached summary and only summarize the
+    turns added since. History is only split before a user message, which
+    keeps tool calls together with their results.
+    """
+
+    def __init__(
+        self,
+        cache: HistorySummaryCache,
+        threshold_tokens: int = 8000,
+        keep_recent_tokens: int = 2000,
+        chunk_tokens: int = 12000,
+    ):
+        self.cache = cache
+        self.threshold_tokens = threshold_tokens
+        self.keep_recent_tokens = keep_recent_tokens
+        self.chunk_tokens = chunk_tokens
+
+    async def compact(
+        self, messages: Messages, counter: TokenCounter, summarize: Summarizer
+    ) -> Tuple[Messages, Optional[Dict[str, Any]]]:
+        """
+        Returns the messages to send and a report, or the messages unchanged
+        and None when the history is below the threshold.
+        """
+        lead = 0
+        while lead < len(messages) and messages[lead].get("role") == "system":
+            lead += 1
+        history = messages[lead:]
+
+        costs = [counter.count_message(m) for m in history]
+        # suffix[i]: tokens of history[i:]
+        suffix = [0] * (len(history) + 1)
+        for i in range(len(history) - 1, -1, -1):
+            suffix[i] = suffix[i + 1] + costs[i]
+        original = suffix[0]
+        if original <= self.threshold_tokens:
+            return messages, None
+
+        # Split points: before a user message, never before the final one's turn.
+        boundaries = [
+            i for i in range(1, len(history)) if history[i].get("role") == "user"
+        ]
+        if not boundaries:
+            return messages, None
+
+        keys = self.cache.prefix_keys(history)
+        base, summary = 0, None
+        cached = self.cache.latest(keys, boundaries)
+        if cached is not None:
+            base, summary = cached
+        cache_hit = summary is not None
+        summarized_calls = 0
+
+        def total(position: int, text: Optional[str]) -> int:
+            extra = counter.count_message(summary_message(text)) if text else 0
+            return extra + suffix[position]
+
+        if total(base, summary) > self.threshold_tokens:
+            later = [b for b in boundaries if b > base]
+            recent = [b for b in later if suffix[b] <= self.keep_recent_tokens]
+            target = recent[0] if recent else (later[-1] if later else base)
+
+            while base < target:
+                # Largest step within the chunk budget, at least one turn.
+                step = next(b for b in later if b > base)
+                for b in later:
+                    if b > target:
+                        break
+                    if b > base and suffix[base] - suffix[b] <= self.chunk_tokens:
+                        step = b
+                summary = await summarize(summary, history[base:step])
+                summarized_calls += 1
+                self.cache.put(keys[step], summary)
+                base = step
+
+        if summary is None:
+            return messages, None
+
+        compacted = messages[:lead] + [summary_message(summary)] + history[base:]
+        report = {
+            "original_tokens": original,
+            "compacted_tokens": total(base, summary),
+            "summarized_messages": base,
+            "summary_cached": cache_hit and summarized_calls == 0,
+            "summarizer_calls": summarized_calls,
+        }
+        log.info("Compacted conversation history", extra=report)
+        return compacted, report
@@ -0,0 +1,92 @@
+import json
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+from ..batching.planner import estimate_tokens
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - optional dependency
+    tiktoken = None
+
+log = logging.getLogger(__name__)
+
+# Per-message framing overhead of the chat format (role markers, separators)
+# and the tokens that prime the assistant reply.
+MESSAGE_OVERHEAD_TOKENS = 4
+REPLY_PRIMING_TOKENS = 2
+
+HEURISTIC = "heuristic"
+
+
+class TokenCounter:
+    """
+    Counts tokens with a tiktoken encoding, or with the gateway's
+    ~4 characters/token estimate when tiktoken (or the encoding) is not
+    available.
+    """
+
+    def __init__(self, encoding_name: Optional[str] = None):
+        self._encoding = None
+        if tiktoken is not None and encoding_name:
+            try:
+                self._encoding = tiktoken.get_encoding(encoding_name)
+            except Exception as e:
+                log.warning(
+                    "Tokenizer unavailable, estimating token counts",
+                    extra={"encoding": encoding_name, "error": str(e)},
+                )
+        self.name = encoding_name if self._encoding is not None else HEURISTIC
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        if self._encoding is None:
+            return estimate_tokens(text)
+        return len(self._encoding.encode(text, disallowed_special=()))
+
+    def truncate(self, text: str, max_tokens: int, keep: str = "head") -> str:
+        """`text` cut to at most `max_tokens`, keeping its head or its tail."""
+        if max_tokens <= 0:
+            return ""
+        if self._encoding is None:
+            limit = max_tokens * 4
+            if len(text) <= limit:
+                return text
+            return text[-limit:] if keep == "tail" else text[:limit]
+        tokens = self._encoding.encode(text, disallowed_special=())
+        if len(tokens) <= max_tokens:
+            return text
+        kept = tokens[-max_tokens:] if keep == "tail" else tokens[:max_tokens]
+        return self._encoding.decode(kept)
+
+    def count_message(self, message: Dict[str, Any]) -> int:
+        tokens = MESSAGE_OVERHEAD_TOKENS + self.count(message.get("role") or "")
+        content = message.get("content")
+        if isinstance(content, str):
+            tokens += self.count(content)
+        elif content:
+            tokens += self.count(json.dumps(content, ensure_ascii=False))
+        if message.get("tool_calls"):
+            tokens += self.count(json.dumps(message["tool_calls"], ensure_ascii=False))
+        if message.get("name"):
+            tokens += self.count(message["name"])
+        return tokens
+
+    def count_messages(self, messages: List[Dict[str, Any]]) -> int:
+        return REPLY_PRIMING_TOKENS + sum(self.count_message(m) for m in messages)
+
+
+_counters: Dict[Optional[str], TokenCounter] = {}
+_counters_lock = threading.Lock()
+
+
+def get_token_counter(encoding_name: Optional[str]) -> TokenCounter:
+    """Shared counter per encoding; loading an encoding is expensive."""
+    with _counters_lock:
+        counter = _counters.get(encoding_name)
+        if counter is None:
+            counter = TokenCounter(encoding_name)
+            _counters[encoding_name] = counter
+        return counter
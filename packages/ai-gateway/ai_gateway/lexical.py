@@ -0,0 +1,71 @@
+import math
+import re
+from collections import Counter
+from typing import List, Optional
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def bm25_scores(
+    query: str, documents: List[str], k1: float = 1.2, b: float = 0.75
+) -> List[float]:
+    """
+    Okapi BM25 score of every document for `query`, with IDF computed over
+    the given documents only. Only query terms are counted, so the cost is
+    one tokenization pass over the documents.
+    """
+    query_terms = set(tokenize(query))
+    if not query_terms or not documents:
+        return [0.0] * len(documents)
+
+    term_counts = []
+    lengths = []
+    for document in documents:
+        tokens = tokenize(document)
+        lengths.append(len(tokens))
+        term_counts.append(Counter(t for t in tokens if t in query_terms))
+
+    n = len(documents)
+    avg_length = (sum(lengths) / n) or 1.0
+    document_frequency = Counter()
+    for counts in term_counts:
+        document_frequency.update(counts.keys())
+    idf = {
+        term: math.log(1.0 + (n - df + 0.5) / (df + 0.5))
+        for term, df in document_frequency.items()
+    }
+
+    scores = []
+    for counts, length in zip(term_counts, lengths):
+        norm = k1 * (1.0 - b + b * length / avg_length)
+        scores.append(
+            sum(
+                idf[term] * tf * (k1 + 1.0) / (tf + norm)
+                for term, tf in counts.items()
+            )
+        )
+    return scores
+
+
+def adaptive_candidate_count(
+    num_documents: int, top_n: Optional[int], min_candidates: int
+) -> int:
+    """
+    Number of candidates to keep when no explicit limit is given: grows with
+    sqrt(N) so large pools are cut hard while small ones are barely touched,
+    and never drops below 3x the requested top_n.
+    """
+    wanted = max(
+        min_candidates, 3 * (top_n or 0), math.ceil(4 * math.sqrt(num_documents))
+    )
+    return min(num_documents, wanted)
+
+
+def top_candidates(scores: List[float], limit: int) -> List[int]:
+    """Indices of the `limit` highest scores, ties broken by original order."""
+    ranked = sorted(range(len(scores)), key=lambda i: (-scores[i], i))
+    return sorted(ranked[:limit])
@@ -0,0 +1,152 @@
+"""
+CPU embedding models executed inside the local provider's worker processes.
+
+Spawned workers import this module by name, which also runs the (empty)
+`ai_gateway` package `__init__`. It lives outside `ai_gateway.providers` and
+must only import the standard library, so workers load no providers or
+settings. Optional backends (onnxruntime, tokenizers, numpy) are imported
+only when an ONNX model is requested.
+"""
+
+import hashlib
+import math
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+HASH_MODEL_NAME = "hash-embedding-v1"
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Per-process model cache, populated lazily by `embed_batch`.
+_models: Dict[Tuple[str, Optional[int]], object] = {}
+_model_dir: Optional[str] = None
+_dimensions: int = 1024
+
+
+class HashingEmbeddingModel:
+    """
+    Deterministic feature-hashing embedder (word unigrams plus character
+    trigrams, signed hashing, L2-normalized). Needs no weights or network,
+    so it serves as an offline test model with stable outputs.
+    """
+
+    def __init__(self, dimensions: int):
+        self.dimensions = dimensions
+
+    def _features(self, text: str) -> List[str]:
+        features = []
+        for token in _TOKEN_RE.findall(text.lower()):
+            features.append(token)
+            padded = f"#{token}#"
+            features.extend(padded[i : i + 3] for i in range(len(padded) - 2))
+        return features
+
+    def embed_one(self, text: str) -> List[float]:
+        vector = [0.0] * self.dimensions
+        for feature in self._features(text):
+            digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+            value = int.from_bytes(digest, "little")
+            sign = 1.0 if value & 1 else -1.0
+            vector[(value >> 1) % self.dimensions] += sign
+        norm = math.sqrt(sum(v * v for v in vector))
+        if norm:
+            vector = [v / norm for v in vector]
+        return vector
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_one(text) for text in texts]
+
+
+class OnnxEmbeddingModel:
+    """
+    Sentence-embedding model exported to ONNX, mean-pooled and L2-normalized.
+    Expects `<model_dir>/model.onnx` and a Hugging Face `tokenizer.json`.
+    """
+
+    def __init__(self, model_dir: Path, max_length: int = 512):
+        import numpy as np
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        self.np = np
+        options = ort.SessionOptions()
+        # Parallelism comes from the process pool; keep each session single-threaded.
+        options.intra_op_num_threads = 1
+        options.inter_op_num_threads = 1
+        self.session = ort.InferenceSession(
+            str(model_dir / "model.onnx"),
+            sess_options=options,
+            providers=["CPUExecutionProvider"],
+        )
+        self.input_names = {i.name for i in self.session.get_inputs()}
+        self.tokenizer = Tokenizer.from_file(str(model_dir / "tokenizer.json"))
+        self.tokenizer.enable_padding()
+        self.tokenizer.enable_truncation(max_length=max_length)
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        np = self.np
+        encoded = self.tokenizer.encode_batch(texts)
+        input_ids = np.array([e.ids for e in encoded], dtype=np.int64)
+        attention_mask = np.array([e.attention_mask for e in encoded], dtype=np.int64)
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self.input_names:
+            feeds["token_type_ids"] = np.zeros_like(input_ids)
+
+        hidden = self.session.run(
+            None, {k: v for k, v in feeds.items() if k in self.input_names}
+        )[0]
+        mask = attention_mask[..., None].astype(hidden.dtype)
+        pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1, None)
+        pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+        return pooled.astype(np.float32).tolist()
+
+
+def init_worker(model_dir: Optional[str], dimensions: int) -> None:
+    """ProcessPoolExecutor initializer: record where models live."""
+    global _model_dir, _dimensions
+    _model_dir = model_dir
+    _dimensions = dimensions
+
+
+def _get_model(name: str, dimensions: Optional[int]):
+    key = (name, dimensions if name == HASH_MODEL_NAME else None)
+    model = _models.get(key)
+    if model is None:
+        if name == HASH_MODEL_NAME:
+            model = HashingEmbeddingModel(dimensions or _dimensions)
+        else:
+            if not _model_dir:
+                raise ValueError(
+                    f"Local model '{name}' requested but no model directory is configured"
+                )
+            path = Path(_model_dir) / name
+            if not (path / "model.onnx").exists():
+                raise ValueError(f"Local model not found: {path / 'model.onnx'}")
+            model = OnnxEmbeddingModel(path)
+        _models[key] = model
+    return model
+
+
+def _truncate(vector: List[float], dimensions: int) -> List[float]:
+    """Matryoshka prefix of `vector`, L2-renormalized."""
+    if dimensions > len(vector):
+        raise ValueError(
+            f"Requested {dimensions} dimensions but the model produces {len(vector)}"
+        )
+    prefix = vector[:dimensions]
+    norm = math.sqrt(sum(x * x for x in prefix))
+    return [x / norm for x in prefix] if norm else prefix
+
+
+def embed_batch(
+    model_name: str, texts: List[str], dimensions: Optional[int] = None
+) -> List[List[float]]:
+    """
+    Worker entry point: embed `texts` with the named model. The hashing
+    model embeds at `dimensions` directly; ONNX output is truncated to it.
+    """
+    vectors = _get_model(model_name, dimensions).embed(texts)
+    if dimensions and model_name != HASH_MODEL_NAME:
+        vectors = [_truncate(vector, dimensions) for vector in vectors]
+    return vectors
@@ -1,11 +1,16 @@
+import asyncio
 import uvicorn
 import logging
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from asgi_correlation_id import CorrelationIdMiddleware
 
 from .telemetry import setup_telemetry, instrument_app
 from .config import settings
+from .context import preload_tokenizers
+from .providers import embedding_providers
+from .providers.upstream import upstream_clients
 from .routes.chat import router as chat_router
 from .routes.embedding import router as embedding_router
 from .routes.tts import router as tts_router
@@ -15,10 +20,21 @@ from .routes.rerank import router as rerank_router
 setup_telemetry(settings.otel_service_name)
 log = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    upstream_clients.log_startup()
+    await asyncio.to_thread(preload_tokenizers)
+    yield
+    await upstream_clients.aclose()
+    await asyncio.to_thread(embedding_providers["local"].shutdown)
+
+
 app = FastAPI(
     title="AI Gateway",
     description="A unified API for multiple AI providers.",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Add middleware and instrumentation
@@ -65,9 +65,12 @@ class ModelsRegistry:
                     "version": model["version"],
                     "timestamp": model["timestamp"],
                     "dimensions": model["dimensions"],
+                    "supportedDimensions": model.get("supportedDimensions"),
                     "isDefault": model.get("isDefault", False),
                     "isDeprecated": model.get("isDeprecated", False),
                     "deprecationDate": model.get("deprecationDate"),
+                    "capabilities": model.get("capabilities", {}),
+                    "calibration": model.get("calibration", {}),
                     "fullModel": self._build_model_string(model),
                 }
             )
@@ -87,6 +90,61 @@ class ModelsRegistry:
                 return m
         return None
 
+    def get_capabilities(self, provider: str, model: str) -> Dict:
+        """Get the batching capabilities declared for a model (empty if unknown)."""
+        m = self.get_model(provider, model)
+        return (m or {}).get("capabilities") or {}
+
+    def get_calibration(
+        self,
+        provider: str,
+        model: str,
+        quantization: Optional[str],
+        dimensions: Optional[int] = None,
+    ) -> Optional[Dict]:
+        """
+        Get the calibration stored for `quantization` at the output size
+        actually served (native when `dimensions` is None). Ranges are kept
+        per output size because truncation and re-normalization scale every
+        component by roughly sqrt(native / dimensions). Returns None when no
+        range is stored for that size, so callers use the observed range.
+        """
+        m = self.get_model(provider, model)
+        if not m or not quantization:
+            return None
+        entry = (m.get("calibration") or {}).get(quantization)
+        if not entry:
+            return None
+        size = dimensions or m.get("dimensions")
+        if "min" in entry and "max" in entry:
+            # Un-keyed range: only valid at the native size.
+            return entry if size == m.get("dimensions") else None
+        return entry.get(size) or entry.get(str(size))
+
+    def validate_dimensions(self, provider: str, model: str, dimensions: int) -> None:
+        """
+        Check a requested output size against the model's declared dimensions
+        and `supportedDimensions`. Unregistered models accept any positive size.
+
+        Raises:
+            ValueError: If the size is not supported by the model.
+        """
+        if dimensions < 1:
+            raise ValueError("dimensions must be a positive integer")
+        m = self.get_model(provider, model)
+        if not m:
+            return
+        if dimensions > m["dimensions"]:
+            raise ValueError(
+                f"{provider}/{model} produces {m['dimensions']} dimensions; "
+                f"cannot return {dimensions}"
+            )
+        supported = m.get("supportedDimensions")
+        if supported and dimensions not in supported:
+            raise ValueError(
+                f"{provider}/{model} supports dimensions {supported}, got {dimensions}"
+            )
+
     def set_default_model(self, provider: str, model: str) -> bool:
         """Set a model as the default and save to YAML file."""
         target_model = self.get_model(provider, model)
@@ -0,0 +1,88 @@
+"""
+Microbenchmark for PromptRegistry lookups and rendering.
+
+    python -m ai_gateway.prompts.benchmark [--iterations 2000]
+
+For every prompt it reports the mean latest-version lookup time and the
+mean render time with sample variables. Messages-form prompts that have a
+precompiled plan are also timed on the render-then-YAML-parse path for
+comparison.
+"""
+
+import argparse
+import time
+from typing import Any, Callable, Dict
+
+from . import prompt_registry
+from .registry import PromptEntry
+
+SAMPLE_MESSAGES = [
+    {"role": "user", "content": "What does the report say about churn?"},
+    {"role": "assistant", "content": "Let me look that up in your documents."},
+]
+
+
+def sample_vars(entry: PromptEntry) -> Dict[str, Any]:
+    """Placeholder values for every declared or inferred variable."""
+    values: Dict[str, Any] = {}
+    for variable in entry.variables:
+        if isinstance(variable, str):
+            values[variable] = "sample text"
+            continue
+        if variable.get("type") == "list":
+            values[variable["name"]] = variable.get("item_example") or SAMPLE_MESSAGES
+        else:
+            values[variable["name"]] = "sample text"
+    for name in entry.required_vars:
+        values.setdefault(name, "sample text")
+    return values
+
+
+def time_call(fn: Callable[[], Any], iterations: int) -> float:
+    """Mean wall time per call in microseconds."""
+    fn()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) * 1e6 / iterations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'prompt':<32} {'lookup us':>10} {'render us':>10} {'yaml path us':>13}")
+    for key in prompt_registry.list_prompts():
+        prompt_id, _ = key.split("@", 1)
+        entry = prompt_registry.get_entry(prompt_id)
+        values = sample_vars(entry)
+
+        lookup = time_call(
+            lambda: prompt_registry.get_entry(prompt_id), args.iterations
+        )
+        try:
+            render = time_call(
+                lambda: prompt_registry.render(prompt_id, values), args.iterations
+            )
+        except Exception as exc:
+            print(f"{key:<32} skipped: {exc}")
+            continue
+
+        yaml_path = ""
+        if entry._compiled_messages is not None:
+            try:
+                uncompiled = time_call(
+                    lambda: prompt_registry._render_messages_text(entry, values),
+                    args.iterations,
+                )
+                yaml_path = f"{uncompiled:.1f}"
+            except Exception:
+                # e.g. `history` splices only exist in the compiled form
+                yaml_path = "n/a"
+
+        print(f"{key:<32} {lookup:>10.2f} {render:>10.1f} {yaml_path:>13}")
+
+
+if __name__ == "__main__":
+    main()
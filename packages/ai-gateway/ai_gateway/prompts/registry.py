@@ -2,7 +2,7 @@
 import os
 import logging
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import yaml
 from jinja2 import Environment, FileSystemLoader, Template, StrictUndefined, meta
@@ -40,11 +40,57 @@ class PromptEntry:
         self.meta: Dict[str, Any] = raw.get("meta", {})
         self._compiled_template: Optional[Template] = None
         self._compiled_messages_template: Optional[Template] = None
+        # Render plan, filled in by PromptRegistry at load time.
+        self.required_vars: Tuple[str, ...] = ()
+        self._compiled_messages: Optional[List["MessagePlan"]] = None
 
     def key(self) -> str:
         return f"{self.id}@{self.version}"
 
 
+class MessagePlan:
+    """
+    One element of a compiled messages template: either a single message
+    with its own role/content templates, or a `history` splice that copies
+    a list-of-messages variable into the output.
+    """
+
+    def __init__(
+        self,
+        role: Union[str, Template, None] = None,
+        content: Optional[Template] = None,
+        trailing_newline: bool = True,
+        history_var: Optional[str] = None,
+    ):
+        self.role = role
+        self.content = content
+        self.trailing_newline = trailing_newline
+        self.history_var = history_var
+
+    def render(self, vars: Dict[str, Any]) -> List[Dict[str, Any]]:
+        if self.history_var is not None:
+            if self.history_var not in vars:
+                raise PromptRenderError(
+                    f"'{self.history_var}' is undefined (history messages)"
+                )
+            out = []
+            for i, m in enumerate(vars[self.history_var] or []):
+                if not isinstance(m, dict) or "content" not in m:
+                    raise PromptRenderError(
+                        f"{self.history_var} element #{i} invalid: {m!r}"
+                    )
+                out.append({"role": m.get("role", "user"), "content": m["content"]})
+            return out
+
+        role = self.role if isinstance(self.role, str) else self.role.render(**vars)
+        content = self.content.render(**vars)
+        # Match YAML block-scalar "clip" chomping of the uncompiled path.
+        content = content.rstrip("\n")
+        if self.trailing_newline:
+            content += "\n"
+        return [{"role": role, "content": content}]
+
+
 class PromptRegistry:
     """
     Loads all YAML prompts from a directory into memory and provides
@@ -65,6 +111,7 @@ class PromptRegistry:
             autoescape=False,
         )
         self._store: Dict[str, PromptEntry] = {}
+        self._latest: Dict[str, PromptEntry] = {}
         self._load_all_into_memory()
 
     def _load_all_into_memory(self) -> None:
@@ -92,6 +139,8 @@ class PromptRegistry:
                     entry._compiled_messages_template = self.jinja.from_string(
                         entry.messages_template_text
                     )
+                    entry._compiled_messages = self._compile_messages(entry)
+                entry.required_vars = tuple(self._declared_required_vars(entry))
                 key = entry.key()
                 if key in self._store:
                     log.warning(
@@ -115,6 +164,11 @@ class PromptRegistry:
                     extra={"method": "_load_all_into_memory"},
                 )
 
+        for entry in self._store.values():
+            latest = self._latest.get(entry.id)
+            if latest is None or entry.version > latest.version:
+                self._latest[entry.id] = entry
+
         log.info(
             "Loaded %d prompt templates into memory",
             len(self._store),
@@ -125,23 +179,57 @@ class PromptRegistry:
         return sorted(self._store.keys())
 
     def get_entry(self, prompt_id: str, version: Optional[str] = None) -> PromptEntry:
-        key = f"{prompt_id}@{version}" if version is not None else None
-        entry = self._store.get(key) if key is not None else None
+        if version is None:
+            entry = self._latest.get(prompt_id)
+        else:
+            entry = self._store.get(f"{prompt_id}@{version}")
         if entry:
             return entry
-        candidates = [
-            e for k, e in self._store.items() if k.startswith(f"{prompt_id}@")
-        ]
-        if candidates:
-            if version is None:
-                candidates_sorted = sorted(
-                    candidates, key=lambda e: e.version, reverse=True
-                )
-                return candidates_sorted[0]
         raise PromptNotFound(
             f"Prompt not found: {prompt_id}@{version if version is not None else 'latest'}"
         )
 
+    def _compile_messages(self, entry: PromptEntry) -> Optional[List[MessagePlan]]:
+        """
+        Compile a messages template whose YAML structure is static (Jinja only
+        inside role/content strings) into per-message templates, so rendering
+        needs no YAML parse. Elements may also be `- history: <var>` to splice
+        a list of messages. Returns None when the structure itself is
+        templated; those prompts use the render-then-parse path.
+        """
+        try:
+            parsed = yaml.safe_load(entry.messages_template_text)
+        except yaml.YAMLError:
+            return None
+        if not isinstance(parsed, list):
+            return None
+
+        plan = []
+        for item in parsed:
+            if not isinstance(item, dict):
+                return None
+            if set(item) == {"history"} and isinstance(item["history"], str):
+                plan.append(MessagePlan(history_var=item["history"]))
+                continue
+            role = item.get("role", "user")
+            content = item.get("content")
+            if not isinstance(role, str) or not isinstance(content, str):
+                return None
+            plan.append(
+                MessagePlan(
+                    role=self.jinja.from_string(role) if "{" in role else role,
+                    content=self.jinja.from_string(content),
+                    trailing_newline=content.endswith("\n"),
+                )
+            )
+        log.debug(
+            "Compiled %s into %d message templates",
+            entry.key(),
+            len(plan),
+            extra={"method": "_compile_messages"},
+        )
+        return plan
+
     def _declared_required_vars(self, entry: PromptEntry) -> List[str]:
         reqs = []
         for v in entry.variables:
@@ -165,8 +253,7 @@ class PromptRegistry:
             return []
 
     def _validate_vars(self, entry: PromptEntry, vars: Dict[str, Any]) -> None:
-        required = self._declared_required_vars(entry)
-        missing = [r for r in required if r not in (vars or {})]
+        missing = [r for r in entry.required_vars if r not in (vars or {})]
         if missing:
             raise PromptValidationError(
                 f"Missing required variables for {entry.key()}: {missing}"
@@ -197,26 +284,14 @@ class PromptRegistry:
                     raise PromptRenderError(
                         f"Prompt {entry.key()} declares form 'messages' but has no messages_template"
                     )
-                rendered = entry._compiled_messages_template.render(**vars)
-                try:
-                    messages_parsed = yaml.safe_load(rendered)
-                except Exception as exc:
-                    raise PromptRenderError(
-                        f"Rendered messages_template is not valid YAML/JSON: {exc}"
-                    ) from exc
-                if not isinstance(messages_parsed, list):
-                    raise PromptRenderError(
-                        "messages_template must render to a YAML/JSON list of messages"
-                    )
-                out_messages = []
-                for i, m in enumerate(messages_parsed):
-                    if not isinstance(m, dict) or "content" not in m:
-                        raise PromptRenderError(
-                            f"messages_template element #{i} invalid: {m!r}"
-                        )
-                    out_messages.append(
-                        {"role": m.get("role", "user"), "content": m["content"]}
-                    )
+                if entry._compiled_messages is not None:
+                    out_messages = [
+                        message
+                        for step in entry._compiled_messages
+                        for message in step.render(vars)
+                    ]
+                else:
+                    out_messages = self._render_messages_text(entry, vars)
                 return {
                     "type": entry.id,
                     "version": entry.version,
@@ -252,6 +327,33 @@ class PromptRegistry:
                 f"Failed to render prompt {entry.key()}: {exc}"
             ) from exc
 
+    def _render_messages_text(
+        self, entry: PromptEntry, vars: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """
+        Uncompiled path: render the whole messages template to text and parse
+        the result as YAML. Used when the template's structure is templated.
+        """
+        rendered = entry._compiled_messages_template.render(**vars)
+        try:
+            messages_parsed = yaml.safe_load(rendered)
+        except Exception as exc:
+            raise PromptRenderError(
+                f"Rendered messages_template is not valid YAML/JSON: {exc}"
+            ) from exc
+        if not isinstance(messages_parsed, list):
+            raise PromptRenderError(
+                "messages_template must render to a YAML/JSON list of messages"
+            )
+        out_messages = []
+        for i, m in enumerate(messages_parsed):
+            if not isinstance(m, dict) or "content" not in m:
+                raise PromptRenderError(
+                    f"messages_template element #{i} invalid: {m!r}"
+                )
+            out_messages.append({"role": m.get("role", "user"), "content": m["content"]})
+        return out_messages
+
     def inspect(self, prompt_id: str, version: Optional[str] = None) -> Dict[str, Any]:
         """
         Return the raw YAML meta (as dict) and whether templates are compiled.
@@ -266,5 +368,7 @@ class PromptRegistry:
             "variables": entry.variables,
             "has_template": entry._compiled_template is not None,
             "has_messages_template": entry._compiled_messages_template is not None,
+            "messages_precompiled": entry._compiled_messages is not None,
+            "required_vars": list(entry.required_vars),
             "raw": entry.raw,
         }
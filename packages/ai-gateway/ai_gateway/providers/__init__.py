@@ -4,6 +4,7 @@ from .providers.elevenlabs import ElevenLabsProvider
 
 from .embedding.jina import JinaEmbeddingProvider
 from .embedding.ollama import OllamaEmbeddingProvider
+from .embedding.local import LocalEmbeddingProvider
 
 from .base import GeneralProvider, EmbeddingProvider
 from ..config import settings
@@ -26,6 +27,7 @@ general_providers: dict[str, GeneralProvider] = {
 embedding_providers: dict[str, EmbeddingProvider] = {
     "jina": JinaEmbeddingProvider(),
     "ollama": OllamaEmbeddingProvider(),
+    "local": LocalEmbeddingProvider(),
 }
 
 
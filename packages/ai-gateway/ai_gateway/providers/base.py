@@ -21,6 +21,14 @@ class GeneralProvider(ABC):
         log.warning("provider_unsupported_method", extra={"method": "generate_text"})
         raise NotImplementedError("Text generation is not supported by this provider")
 
+    async def generate_text_async(
+        self, messages: List[Dict[str, Any]], request: ChatCompletionRequest
+    ):
+        log.warning(
+            "provider_unsupported_method", extra={"method": "generate_text_async"}
+        )
+        raise NotImplementedError("Text generation is not supported by this provider")
+
     async def generate_text_stream(
         self, messages: List[Dict[str, Any]], request: ChatCompletionRequest
     ) -> AsyncGenerator[str, None]:
@@ -49,6 +57,13 @@ class EmbeddingProvider(ABC):
         )
         raise NotImplementedError("Embeddings are not supported by this provider")
 
+    async def generate_embeddings_async(self, input_text, model, options):
+        log.warning(
+            "provider_unsupported_method",
+            extra={"method": "generate_embeddings_async"},
+        )
+        raise NotImplementedError("Embeddings are not supported by this provider")
+
     def rerank(
         self,
         query: str,
@@ -58,3 +73,13 @@ class EmbeddingProvider(ABC):
     ):
         log.warning("provider_unsupported_method", extra={"method": "rerank"})
         raise NotImplementedError("Reranking is not supported by this provider")
+
+    async def rerank_async(
+        self,
+        query: str,
+        documents: List[str],
+        model: str,
+        top_n: Optional[int] = None,
+    ):
+        log.warning("provider_unsupported_method", extra={"method": "rerank_async"})
+        raise NotImplementedError("Reranking is not supported by this provider")
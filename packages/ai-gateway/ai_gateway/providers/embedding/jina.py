@@ -3,6 +3,8 @@ import httpx
 from typing import List, Optional
 from opentelemetry import trace
 from ..base import EmbeddingProvider
+from ..errors import ProviderError
+from ..upstream import upstream_clients
 from ...config import settings
 from ...schemas import EmbeddingResponse
 
@@ -11,20 +13,78 @@ tracer = trace.get_tracer(__name__)
 
 
 class JinaEmbeddingProvider(EmbeddingProvider):
+    @staticmethod
+    def _headers() -> dict:
+        return {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {settings.jina_api_key}",
+        }
+
+    @staticmethod
+    def _normalize_input(input_text) -> List[str]:
+        if isinstance(input_text, str):
+            return [input_text]
+        return input_text
+
+    @staticmethod
+    def _to_response(response_data: dict) -> EmbeddingResponse:
+        return EmbeddingResponse(
+            provider="jina",
+            model=response_data.get("model"),
+            data=response_data.get("data"),
+            usage=response_data.get("usage"),
+        )
+
     def generate_embeddings(self, input_text, model, options: object = {}):
         with tracer.start_as_current_span("jina_generate_embeddings") as span:
             span.set_attribute("model", model)
 
-            headers = {
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {settings.jina_api_key}",
+            input_data = self._normalize_input(input_text)
+            span.set_attribute("input_count", len(input_data))
+
+            data = {
+                "model": model,
+                "input": input_data,
+                **options,
             }
 
-            if isinstance(input_text, str):
-                input_data = [input_text]
-            else:
-                input_data = input_text
+            try:
+                response = upstream_clients.get_client(settings.jina_api_url).post(
+                    f"{settings.jina_api_url}/embeddings",
+                    json=data,
+                    headers=self._headers(),
+                )
+                response.raise_for_status()
+                response_data = response.json()
+
+                log.debug(
+                    "Jina embeddings success",
+                    extra={"model": model, "input_count": len(input_data)},
+                )
+                return self._to_response(response_data)
+            except httpx.HTTPStatusError as e:
+                log.error(
+                    "Jina API error", extra={"status_code": e.response.status_code}
+                )
+                span.set_attribute("error", True)
+                span.record_exception(e)
+                raise ProviderError.from_status_error("Jina API Error", e) from e
+            except Exception as e:
+                log.error("Jina provider error", extra={"error": str(e)})
+                span.set_attribute("error", True)
+                span.record_exception(e)
+                raise ProviderError.from_exception(
+                    f"An unexpected error occurred with Jina provider: {e}", e
+                ) from e
+
+    async def generate_embeddings_async(self, input_text, model, options: object = {}):
+        """
+        Non-blocking variant of `generate_embeddings` using the shared async client.
+        """
+        with tracer.start_as_current_span("jina_generate_embeddings_async") as span:
+            span.set_attribute("model", model)
 
+            input_data = self._normalize_input(input_text)
             span.set_attribute("input_count", len(input_data))
 
             data = {
@@ -34,40 +94,34 @@ class JinaEmbeddingProvider(EmbeddingProvider):
             }
 
             try:
-                with httpx.Client() as httpx_client:
-                    response = httpx_client.post(
-                        f"{settings.jina_api_url}/embeddings",
-                        json=data,
-                        headers=headers,
-                    )
-                    response.raise_for_status()
-                    response_data = response.json()
-
-                    log.debug(
-                        "Jina embeddings success",
-                        extra={"model": model, "input_count": len(input_data)},
-                    )
-                    return EmbeddingResponse(
-                        provider="jina",
-                        model=response_data.get("model"),
-                        data=response_data.get("data"),
-                        usage=response_data.get("usage"),
-                    )
+                response = await upstream_clients.get_async_client(
+                    settings.jina_api_url
+                ).post(
+                    f"{settings.jina_api_url}/embeddings",
+                    json=data,
+                    headers=self._headers(),
+                )
+                response.raise_for_status()
+                response_data = response.json()
+
+                log.debug(
+                    "Jina embeddings success",
+                    extra={"model": model, "input_count": len(input_data)},
+                )
+                return self._to_response(response_data)
             except httpx.HTTPStatusError as e:
                 log.error(
                     "Jina API error", extra={"status_code": e.response.status_code}
                 )
                 span.set_attribute("error", True)
                 span.record_exception(e)
-                raise Exception(
-                    f"Jina API Error: {e.response.status_code} - {e.response.text}"
-                ) from e
+                raise ProviderError.from_status_error("Jina API Error", e) from e
             except Exception as e:
                 log.error("Jina provider error", extra={"error": str(e)})
                 span.set_attribute("error", True)
                 span.record_exception(e)
-                raise Exception(
-                    f"An unexpected error occurred with Jina provider: {e}"
+                raise ProviderError.from_exception(
+                    f"An unexpected error occurred with Jina provider: {e}", e
                 ) from e
 
     def rerank(
@@ -87,34 +141,85 @@ class JinaEmbeddingProvider(EmbeddingProvider):
             if top_n:
                 span.set_attribute("top_n", top_n)
 
-            headers = {
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {settings.jina_api_key}",
+            data = {
+                "model": model,
+                "query": query,
+                "documents": documents,
             }
 
+            if top_n is not None:
+                data["top_n"] = top_n
+
+            try:
+                response = upstream_clients.get_client(settings.jina_api_url).post(
+                    f"{settings.jina_api_url}/rerank",
+                    json=data,
+                    headers=self._headers(),
+                    timeout=30.0,  # Reranking can take longer than embeddings
+                )
+                response.raise_for_status()
+                log.debug(
+                    "Jina rerank success",
+                    extra={"model": model, "document_count": len(documents)},
+                )
+                return response.json()
+            except httpx.HTTPStatusError as e:
+                log.error(
+                    "Jina Rerank API error",
+                    extra={"status_code": e.response.status_code},
+                )
+                span.set_attribute("error", True)
+                span.record_exception(e)
+                raise ProviderError.from_status_error("Jina Rerank API Error", e) from e
+            except Exception as e:
+                log.error("Jina rerank error", extra={"error": str(e)})
+                span.set_attribute("error", True)
+                span.record_exception(e)
+                raise ProviderError.from_exception(
+                    f"An unexpected error occurred during reranking: {e}", e
+                ) from e
+
+    async def rerank_async(
+        self,
+        query: str,
+        documents: List[str],
+        model: str = "jina-reranker-v2-base-multilingual",
+        top_n: Optional[int] = None,
+    ):
+        """
+        Non-blocking variant of `rerank` using the shared async client.
+        """
+        with tracer.start_as_current_span("jina_rerank_async") as span:
+            span.set_attribute("model", model)
+            span.set_attribute("document_count", len(documents))
+            if top_n:
+                span.set_attribute("top_n", top_n)
+
             data = {
                 "model": model,
                 "query": query,
                 "documents": documents,
+                "return_documents": False,
             }
 
             if top_n is not None:
                 data["top_n"] = top_n
 
             try:
-                with httpx.Client() as httpx_client:
-                    response = httpx_client.post(
-                        f"{settings.jina_api_url}/rerank",
-                        json=data,
-                        headers=headers,
-                        timeout=30.0,  # Reranking can take longer than embeddings
-                    )
-                    response.raise_for_status()
-                    log.debug(
-                        "Jina rerank success",
-                        extra={"model": model, "document_count": len(documents)},
-                    )
-                    return response.json()
+                response = await upstream_clients.get_async_client(
+                    settings.jina_api_url
+                ).post(
+                    f"{settings.jina_api_url}/rerank",
+                    json=data,
+                    headers=self._headers(),
+                    timeout=30.0,  # Reranking can take longer than embeddings
+                )
+                response.raise_for_status()
+                log.debug(
+                    "Jina rerank success",
+                    extra={"model": model, "document_count": len(documents)},
+                )
+                return response.json()
             except httpx.HTTPStatusError as e:
                 log.error(
                     "Jina Rerank API error",
@@ -122,13 +227,11 @@ class JinaEmbeddingProvider(EmbeddingProvider):
                 )
                 span.set_attribute("error", True)
                 span.record_exception(e)
-                raise Exception(
-                    f"Jina Rerank API Error: {e.response.status_code} - {e.response.text}"
-                ) from e
+                raise ProviderError.from_status_error("Jina Rerank API Error", e) from e
             except Exception as e:
                 log.error("Jina rerank error", extra={"error": str(e)})
                 span.set_attribute("error", True)
                 span.record_exception(e)
-                raise Exception(
-                    f"An unexpected error occurred during reranking: {e}"
+                raise ProviderError.from_exception(
+                    f"An unexpected error occurred during reranking: {e}", e
                 ) from e
@@ -0,0 +1,145 @@
+import asyncio
+import logging
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+from opentelemetry import trace
+from ..base import EmbeddingProvider
+from ..errors import ProviderError
+from ...config import settings
+from ...schemas import EmbeddingResponse
+from ... import local_embedding_models as local_models
+
+log = logging.getLogger(__name__)
+tracer = trace.get_tracer(__name__)
+
+
+class LocalEmbeddingProvider(EmbeddingProvider):
+    """
+    Runs CPU embedding models in a process pool sized to the core count.
+
+    `hash-embedding-v1` is a deterministic, weight-free model that always
+    works offline. Any other model name is loaded from
+    `<local_embedding_model_dir>/<model>/model.onnx` (requires onnxruntime,
+    tokenizers and numpy). The `dimensions` option is honoured: the hashing
+    model embeds at that size, ONNX output is truncated and re-normalized.
+    """
+
+    def __init__(self):
+        self.workers = settings.local_embedding_workers or os.cpu_count() or 1
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        # Created on first use so importing the gateway never spawns processes.
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=local_models.init_worker,
+                initargs=(
+                    settings.local_embedding_model_dir,
+                    settings.local_embedding_dimensions,
+                ),
+            )
+            log.info("Local embedding pool started", extra={"workers": self.workers})
+        return self._pool
+
+    def shutdown(self) -> None:
+        """Stops the worker processes; called on application shutdown."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+            log.info("Local embedding pool stopped")
+
+    @staticmethod
+    def _dimensions(options) -> Optional[int]:
+        dimensions = (options or {}).get("dimensions")
+        if dimensions is None:
+            return None
+        if not isinstance(dimensions, int) or dimensions <= 0:
+            raise ValueError(f"Invalid dimensions: {dimensions!r}")
+        return dimensions
+
+    @staticmethod
+    def _normalize_input(input_text) -> List[str]:
+        if isinstance(input_text, str):
+            return [input_text]
+        return input_text
+
+    def _shards(self, input_data: List[str]) -> List[List[str]]:
+        """Split inputs evenly across workers."""
+        size = max(1, math.ceil(len(input_data) / self.workers))
+        return [input_data[i : i + size] for i in range(0, len(input_data), size)]
+
+    @staticmethod
+    def _to_response(
+        vectors: List[List[float]], model: str, input_data: List[str]
+    ) -> EmbeddingResponse:
+        prompt_tokens = sum(len(text.split()) for text in input_data)
+        return EmbeddingResponse(
+            provider="local",
+            model=model,
+            data=[
+                {"object": "embedding", "embedding": vector, "index": i}
+                for i, vector in enumerate(vectors)
+            ],
+            usage={"prompt_tokens": prompt_tokens, "total_tokens": prompt_tokens},
+        )
+
+    def generate_embeddings(self, input_text, model, options: object = {}):
+        with tracer.start_as_current_span("local_generate_embeddings") as span:
+            span.set_attribute("model", model)
+            input_data = self._normalize_input(input_text)
+            span.set_attribute("input_count", len(input_data))
+
+            try:
+                dimensions = self._dimensions(options)
+                futures = [
+                    self.pool.submit(
+                        local_models.embed_batch, model, shard, dimensions
+                    )
+                    for shard in self._shards(input_data)
+                ]
+                vectors = [v for future in futures for v in future.result()]
+                return self._to_response(vectors, model, input_data)
+            except Exception as e:
+                log.error("Local embedding error", extra={"error": str(e)})
+                span.set_attribute("error", True)
+                span.record_exception(e)
+                raise ProviderError(
+                    f"An unexpected error occurred with local provider: {e}"
+                ) from e
+
+    async def generate_embeddings_async(self, input_text, model, options: object = {}):
+        with tracer.start_as_current_span("local_generate_embeddings_async") as span:
+            span.set_attribute("model", model)
+            input_data = self._normalize_input(input_text)
+            span.set_attribute("input_count", len(input_data))
+
+            loop = asyncio.get_running_loop()
+            try:
+                dimensions = self._dimensions(options)
+                shards = await asyncio.gather(
+                    *(
+                        loop.run_in_executor(
+                            self.pool,
+                            local_models.embed_batch,
+                            model,
+                            shard,
+                            dimensions,
+                        )
+                        for shard in self._shards(input_data)
+                    )
+                )
+                vectors = [v for shard in shards for v in shard]
+                return self._to_response(vectors, model, input_data)
+            except Exception as e:
+                log.error("Local embedding error", extra={"error": str(e)})
+                span.set_attribute("error", True)
+                span.record_exception(e)
+                raise ProviderError(
+                    f"An unexpected error occurred with local provider: {e}"
+                ) from e
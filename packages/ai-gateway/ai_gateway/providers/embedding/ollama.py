@@ -1,16 +1,81 @@
 import logging
 import httpx
-from typing import List, Optional
+from typing import Iterator, List, Optional, Tuple
 from opentelemetry import trace
 from ..base import EmbeddingProvider
+from ..errors import ProviderError
+from ..upstream import upstream_clients
 from ...config import settings
 from ...schemas import EmbeddingResponse
 
 log = logging.getLogger(__name__)
 tracer = trace.get_tracer(__name__)
 
+OLLAMA_EMBED_URL = "http://185.147.236.12:11434/api/embed"
+OLLAMA_EMBED_MODEL = "qwen3-embedding:4b"
+
 
 class OllamaEmbeddingProvider(EmbeddingProvider):
+    @staticmethod
+    def _normalize_input(input_text) -> List[str]:
+        if isinstance(input_text, str):
+            return [input_text]
+        return input_text
+
+    @staticmethod
+    def _sub_batches(input_data: List[str]) -> Iterator[Tuple[int, List[str]]]:
+        """
+        Yield (offset, texts) slices sized by `ollama_embedding_batch_size`.
+        Only the blocking path uses this; it has no planner in front of it.
+        """
+        size = max(1, settings.ollama_embedding_batch_size)
+        for offset in range(0, len(input_data), size):
+            yield offset, input_data[offset : offset + size]
+
+    @staticmethod
+    def _build_payload(texts: List[str], options: dict) -> dict:
+        return {
+            "model": OLLAMA_EMBED_MODEL,
+            "input": texts,
+            "dimensions": options.get("dimensions", 1024),
+        }
+
+    @staticmethod
+    def _parse_batch(
+        response_data: dict, offset: int, texts: List[str]
+    ) -> Tuple[List[dict], int]:
+        """
+        Convert one /api/embed batch response into indexed embedding objects.
+        Returns (embeddings, prompt_tokens).
+        """
+        embeddings = response_data.get("embeddings", [])
+        if len(embeddings) != len(texts):
+            raise ValueError(
+                f"Ollama returned {len(embeddings)} embeddings for {len(texts)} inputs"
+            )
+        items = [
+            {"object": "embedding", "embedding": embedding, "index": offset + i}
+            for i, embedding in enumerate(embeddings)
+        ]
+        prompt_tokens = response_data.get("prompt_eval_count")
+        if prompt_tokens is None:
+            prompt_tokens = sum(len(text.split()) for text in texts)
+        return items, prompt_tokens
+
+    @staticmethod
+    def _to_response(
+        all_embeddings: List[dict], model: Optional[str], total_prompt_tokens: int
+    ) -> EmbeddingResponse:
+        return EmbeddingResponse(
+            provider="ollama",
+            model=model or OLLAMA_EMBED_MODEL,
+            data=all_embeddings,
+            usage={
+                "prompt_tokens": total_prompt_tokens,
+                "total_tokens": total_prompt_tokens,
+            },
+        )
+
     def generate_embeddings(self, input_text, model, options: object = {}):
         with tracer.start_as_current_span("ollama_generate_embeddings") as span:
             span.set_attribute("model", model)
@@ -19,53 +84,33 @@ class OllamaEmbeddingProvider(EmbeddingProvider):
                 "Content-Type": "application/json",
             }
 
-            if isinstance(input_text, str):
-                input_data = [input_text]
-            else:
-                input_data = input_text
-
+            input_data = self._normalize_input(input_text)
             span.set_attribute("input_count", len(input_data))
 
             all_embeddings = []
             total_prompt_tokens = 0
+            response_model = None
 
             try:
-                with httpx.Client(timeout=60.0) as httpx_client:
-                    for idx, text in enumerate(input_data):
-                        data = {
-                            "model": "qwen3-embedding:4b",
-                            "input": text,
-                            "dimensions": 1024,
-                        }
-
-                        response = httpx_client.post(
-                            "http://185.147.236.12:11434/api/embed",
-                            json=data,
-                            headers=headers,
-                        )
-                        response.raise_for_status()
-                        response_data = response.json()
-
-                        embeddings = response_data.get("embeddings", [])
-                        if embeddings:
-                            all_embeddings.append(
-                                {
-                                    "object": "embedding",
-                                    "embedding": embeddings[0],
-                                    "index": idx,
-                                }
-                            )
-
-                        total_prompt_tokens += len(text.split())
-
-                return EmbeddingResponse(
-                    provider="ollama",
-                    model=response_data.get("model", "qwen3-embedding:4b"),
-                    data=all_embeddings,
-                    usage={
-                        "prompt_tokens": total_prompt_tokens,
-                        "total_tokens": total_prompt_tokens,
-                    },
+                httpx_client = upstream_clients.get_client(OLLAMA_EMBED_URL)
+                for offset, texts in self._sub_batches(input_data):
+                    response = httpx_client.post(
+                        OLLAMA_EMBED_URL,
+                        json=self._build_payload(texts, options),
+                        headers=headers,
+                    )
+                    response.raise_for_status()
+                    response_data = response.json()
+                    response_model = response_data.get("model")
+
+                    items, prompt_tokens = self._parse_batch(
+                        response_data, offset, texts
+                    )
+                    all_embeddings.extend(items)
+                    total_prompt_tokens += prompt_tokens
+
+                return self._to_response(
+                    all_embeddings, response_model, total_prompt_tokens
                 )
 
             except httpx.HTTPStatusError as e:
@@ -78,13 +123,63 @@ class OllamaEmbeddingProvider(EmbeddingProvider):
                         "response_text": e.response.text,
                     },
                 )
-                raise Exception(
-                    f"Ollama API Error: {e.response.status_code} - {e.response.text}"
+                raise ProviderError.from_status_error("Ollama API Error", e) from e
+            except Exception as e:
+                span.set_attribute("error", True)
+                span.record_exception(e)
+                log.error("Ollama provider error", extra={"error": str(e)})
+                raise ProviderError.from_exception(
+                    f"An unexpected error occurred with Ollama provider: {e}", e
                 ) from e
+
+    async def generate_embeddings_async(self, input_text, model, options: object = {}):
+        """
+        Non-blocking variant of `generate_embeddings` using the shared async client.
+        The input goes out as a single /api/embed call: async callers (the batch
+        planner and micro-batcher) already size and parallelize batches from the
+        model's capabilities, so the provider does not split them again.
+        """
+        with tracer.start_as_current_span("ollama_generate_embeddings_async") as span:
+            span.set_attribute("model", model)
+
+            headers = {
+                "Content-Type": "application/json",
+            }
+
+            input_data = self._normalize_input(input_text)
+            span.set_attribute("input_count", len(input_data))
+
+            try:
+                response = await upstream_clients.get_async_client(
+                    OLLAMA_EMBED_URL
+                ).post(
+                    OLLAMA_EMBED_URL,
+                    json=self._build_payload(input_data, options),
+                    headers=headers,
+                )
+                response.raise_for_status()
+                response_data = response.json()
+
+                items, prompt_tokens = self._parse_batch(response_data, 0, input_data)
+                return self._to_response(
+                    items, response_data.get("model"), prompt_tokens
+                )
+
+            except httpx.HTTPStatusError as e:
+                span.set_attribute("error", True)
+                span.record_exception(e)
+                log.error(
+                    "Ollama API error",
+                    extra={
+                        "status_code": e.response.status_code,
+                        "response_text": e.response.text,
+                    },
+                )
+                raise ProviderError.from_status_error("Ollama API Error", e) from e
             except Exception as e:
                 span.set_attribute("error", True)
                 span.record_exception(e)
                 log.error("Ollama provider error", extra={"error": str(e)})
-                raise Exception(
-                    f"An unexpected error occurred with Ollama provider: {e}"
+                raise ProviderError.from_exception(
+                    f"An unexpected error occurred with Ollama provider: {e}", e
                 ) from e
@@ -0,0 +1,35 @@
+from typing import Optional
+
+import httpx
+
+
+class ProviderError(Exception):
+    """
+    Raised by providers when an upstream call fails. `retryable` is set for
+    transient failures only (timeouts, connection errors, 429 and 5xx), so
+    callers can retry those and surface everything else immediately.
+    """
+
+    def __init__(
+        self,
+        message: str,
+        status_code: Optional[int] = None,
+        retryable: bool = False,
+    ):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retryable = retryable
+
+    @classmethod
+    def from_status_error(cls, prefix: str, e: httpx.HTTPStatusError):
+        status_code = e.response.status_code
+        return cls(
+            f"{prefix}: {status_code} - {e.response.text}",
+            status_code=status_code,
+            retryable=status_code == 429 or status_code >= 500,
+        )
+
+    @classmethod
+    def from_exception(cls, message: str, e: Exception):
+        # httpx.TimeoutException is a TransportError subclass.
+        return cls(message, retryable=isinstance(e, httpx.TransportError))
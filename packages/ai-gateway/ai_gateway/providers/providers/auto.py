@@ -1,10 +1,13 @@
 import logging
-from typing import List, Dict, Any, AsyncGenerator, Tuple
+import time
+from typing import List, Dict, Any, AsyncGenerator, Optional, Tuple
 from opentelemetry import trace
 
 from ..base import GeneralProvider
 from ...prompts.registry import PromptNotFound
 from ...prompts import prompt_registry
+from ...routing import model_router, model_stats
+from ...routing.hedging import STREAM_END, HedgePolicy, hedged_call, hedged_stream
 from ...schemas import ChatCompletionRequest
 
 log = logging.getLogger(__name__)
@@ -20,6 +23,25 @@ class AutoProvider(GeneralProvider):
     def __init__(self, providers_registry=None):
         self.providers_registry = providers_registry or {}
 
+    MODEL_MAP = {
+        "default": ("openai", "z-ai/glm-4.5-air:free"),
+        "tool": ("openai", "mistralai/devstral-2512:free"),
+        "synthesis": ("openai", "mistralai/mistral-small-creative"),
+        "simple": ("openai", "openai/gpt-oss-20b"),
+    }
+
+    def _prompt_meta(self, request: ChatCompletionRequest) -> Dict[str, Any]:
+        if not request.prompt_type:
+            return {}
+        try:
+            entry = prompt_registry.get_entry(
+                request.prompt_type, request.prompt_version
+            )
+            return entry.meta
+        except PromptNotFound:
+            log.warning("Prompt not found for auto-selection, using fallback.")
+            return {}
+
     def _select_model(
         self, request: ChatCompletionRequest
     ) -> Tuple[str, str, GeneralProvider]:
@@ -27,48 +49,126 @@ class AutoProvider(GeneralProvider):
         Selects the provider and model name based on rules.
         Returns: (provider_name, model_name, provider_instance)
         """
+        complexity = self._prompt_meta(request).get("complexity", "default")
 
-        MODEL_MAP = {
-            "default": ("openai", "z-ai/glm-4.5-air:free"),
-            "tool": ("openai", "mistralai/devstral-2512:free"),
-            "synthesis": ("openai", "mistralai/mistral-small-creative"),
-            "simple": ("openai", "openai/gpt-oss-20b"),
-        }
-
-        if request.prompt_type:
-            try:
-                entry = prompt_registry.get_entry(
-                    request.prompt_type, request.prompt_version
-                )
-                complexity = entry.meta.get("complexity", "default")
-                provider_name, model_name = MODEL_MAP.get(
-                    complexity, MODEL_MAP["default"]
-                )
+        # Live-statistics routing among the tier's candidates; the static map
+        # is the fallback when a tier has no usable candidates configured.
+        selected = model_router.choose(complexity)
+        if selected is None or selected[0] not in self.providers_registry:
+            selected = self.MODEL_MAP.get(complexity, self.MODEL_MAP["default"])
+        provider_name, model_name = selected
 
-                log.info(
-                    "AutoProvider selected model based on prompt meta",
-                    extra={
-                        "prompt": request.prompt_type,
-                        "complexity": complexity,
-                        "provider": provider_name,
-                        "model": model_name,
-                    },
-                )
-                return provider_name, model_name, self.providers_registry[provider_name]
-
-            except PromptNotFound:
-                log.warning("Prompt not found for auto-selection, using fallback.")
-
-        provider_name, model_name = MODEL_MAP["default"]
         log.info(
-            "AutoProvider using fallback model",
+            "AutoProvider selected model",
             extra={
+                "prompt": request.prompt_type,
+                "complexity": complexity,
                 "provider": provider_name,
                 "model": model_name,
             },
         )
         return provider_name, model_name, self.providers_registry[provider_name]
 
+    def _select_backup(
+        self, request: ChatCompletionRequest, primary: Tuple[str, str]
+    ) -> Tuple[str, str]:
+        """
+        Best-ranked candidate of the same tier other than `primary`; the
+        primary itself (a second upstream attempt) if the tier has no other.
+        """
+        complexity = self._prompt_meta(request).get("complexity", "default")
+        for candidate in model_router.rank(complexity):
+            if candidate != primary and candidate[0] in self.providers_registry:
+                return candidate
+        return primary
+
+    @staticmethod
+    def _record_error(provider_name: str, model_name: str, error: Exception) -> None:
+        rate_limited = getattr(error, "status_code", None) == 429
+        model_stats.record_error(provider_name, model_name, rate_limited=rate_limited)
+
+    @staticmethod
+    def _record_completion(
+        provider_name: str, model_name: str, response: Dict[str, Any], elapsed: float
+    ) -> None:
+        """
+        Non-streaming calls have no first-token time; they feed the
+        end-to-end latency, tokens/sec and the error rates.
+        """
+        usage = response.get("usage") or {}
+        tokens: Optional[int] = usage.get("completion_tokens")
+        model_stats.record_success(
+            provider_name,
+            model_name,
+            latency=elapsed,
+            tokens=tokens if isinstance(tokens, int) else None,
+            generation_seconds=elapsed,
+        )
+
+    async def _call_async(
+        self,
+        provider_name: str,
+        model_name: str,
+        messages: List[Dict[str, Any]],
+        request: ChatCompletionRequest,
+    ) -> Dict[str, Any]:
+        """One upstream non-streaming attempt, recorded in the model stats."""
+        attempt = request.model_copy(update={"model": model_name})
+        started = time.monotonic()
+        try:
+            response = await self.providers_registry[
+                provider_name
+            ].generate_text_async(messages=messages, request=attempt)
+        except Exception as e:
+            self._record_error(provider_name, model_name, e)
+            raise
+        self._record_completion(
+            provider_name, model_name, response, time.monotonic() - started
+        )
+        return response
+
+    async def _call_stream(
+        self,
+        provider_name: str,
+        model_name: str,
+        messages: List[Dict[str, Any]],
+        request: ChatCompletionRequest,
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        One upstream streaming attempt, recording time-to-first-token and
+        streaming throughput for the router. Throughput uses the stream's
+        usage block, the same completion_tokens unit as `_record_completion`,
+        and is skipped when the upstream reports no usage.
+        """
+        attempt = request.model_copy(update={"model": model_name})
+        started = time.monotonic()
+        first_token_at: Optional[float] = None
+        usage: Dict[str, Any] = {}
+        try:
+            async for chunk in self.providers_registry[
+                provider_name
+            ].generate_text_stream(messages=messages, request=attempt):
+                if "usage" in chunk:
+                    usage = chunk["usage"] or {}
+                elif first_token_at is None and (
+                    "content" in chunk or "tool_calls" in chunk
+                ):
+                    first_token_at = time.monotonic()
+                yield chunk
+        except Exception as e:
+            self._record_error(provider_name, model_name, e)
+            raise
+
+        finished = time.monotonic()
+        tokens: Optional[int] = usage.get("completion_tokens")
+        model_stats.record_success(
+            provider_name,
+            model_name,
+            ttft=(first_token_at - started) if first_token_at else None,
+            tokens=tokens if isinstance(tokens, int) else None,
+            generation_seconds=(finished - first_token_at) if first_token_at else None,
+        )
+
     def generate_text(
         self, messages: List[Dict[str, Any]], request: ChatCompletionRequest
     ):
@@ -82,22 +182,98 @@ class AutoProvider(GeneralProvider):
             span.set_attribute("selected_provider", provider_name)
             span.set_attribute("selected_model", model_name)
 
-            return provider_instance.generate_text(messages=messages, request=request)
+            started = time.monotonic()
+            try:
+                response = provider_instance.generate_text(
+                    messages=messages, request=request
+                )
+            except Exception as e:
+                self._record_error(provider_name, model_name, e)
+                raise
+            self._record_completion(
+                provider_name, model_name, response, time.monotonic() - started
+            )
+            return response
+
+    async def generate_text_async(
+        self, messages: List[Dict[str, Any]], request: ChatCompletionRequest
+    ):
+        """
+        Selects a model and delegates the async non-streaming call. Prompts
+        with a `meta.hedge` policy race a backup model once the primary is
+        slower than its latency quantile.
+        """
+        with tracer.start_as_current_span("auto_generate_text_async") as span:
+            provider_name, model_name, _ = self._select_model(request)
+            span.set_attribute("selected_provider", provider_name)
+            span.set_attribute("selected_model", model_name)
+
+            policy = HedgePolicy.from_meta(self._prompt_meta(request))
+            if policy is None:
+                request.model = model_name
+                return await self._call_async(
+                    provider_name, model_name, messages, request
+                )
+
+            candidates = [
+                (provider_name, model_name),
+                self._select_backup(request, (provider_name, model_name)),
+            ]
+            delay = policy.delay(
+                model_stats.peek(provider_name, model_name), streaming=False
+            )
+            span.set_attribute("hedge_delay_seconds", delay)
+            index, response = await hedged_call(
+                [
+                    lambda key=key: self._call_async(*key, messages, request)
+                    for key in candidates
+                ],
+                delay,
+            )
+            span.set_attribute("hedge_winner", index)
+            request.model = candidates[index][1]
+            return response
 
     async def generate_text_stream(
         self, messages: List[Dict[str, Any]], request: ChatCompletionRequest
     ) -> AsyncGenerator[str, None]:
         """
-        Selects a model and delegates the streaming call.
+        Selects a model and delegates the streaming call. Prompts with a
+        `meta.hedge` policy race a backup model for the first token.
         """
         with tracer.start_as_current_span("auto_generate_text_stream") as span:
-            provider_name, model_name, provider_instance = self._select_model(request)
-            request.model = model_name
-
+            provider_name, model_name, _ = self._select_model(request)
             span.set_attribute("selected_provider", provider_name)
             span.set_attribute("selected_model", model_name)
 
-            async for chunk in provider_instance.generate_text_stream(
-                messages=messages, request=request
-            ):
+            policy = HedgePolicy.from_meta(self._prompt_meta(request))
+            if policy is None:
+                request.model = model_name
+                async for chunk in self._call_stream(
+                    provider_name, model_name, messages, request
+                ):
+                    yield chunk
+                return
+
+            candidates = [
+                (provider_name, model_name),
+                self._select_backup(request, (provider_name, model_name)),
+            ]
+            delay = policy.delay(
+                model_stats.peek(provider_name, model_name), streaming=True
+            )
+            span.set_attribute("hedge_delay_seconds", delay)
+            index, stream, first = await hedged_stream(
+                [
+                    lambda key=key: self._call_stream(*key, messages, request)
+                    for key in candidates
+                ],
+                delay,
+            )
+            span.set_attribute("hedge_winner", index)
+            request.model = candidates[index][1]
+            if first is STREAM_END:
+                return
+            yield first
+            async for chunk in stream:
                 yield chunk
@@ -6,6 +6,7 @@ from typing import List, Dict, Any, AsyncGenerator
 from opentelemetry import trace
 
 from ..base import GeneralProvider
+from ..upstream import upstream_clients
 from ...schemas import ChatCompletionRequest
 from ...config import settings
 
@@ -20,19 +21,25 @@ class OpenaiCompatibleProvider(GeneralProvider):
             host=settings.posthog_host,
             privacy_mode=settings.environment == "production",
         )
-        sync_transport = httpx.HTTPTransport(retries=3)
+        # The SDK applies `timeout` per request, overriding the shared pool's
+        # default. Connection failures are retried by the pooled transport
+        # inside each of the SDK's own retries.
+        timeout = httpx.Timeout(
+            settings.chat_upstream_timeout, connect=settings.upstream_connect_timeout
+        )
         self.client = OpenAI(
             api_key=api_key,
             base_url=base_url,
-            http_client=httpx.Client(transport=sync_transport),
+            http_client=upstream_clients.get_client(base_url),
+            timeout=timeout,
             posthog_client=self.posthog,
         )
 
-        async_transport = httpx.AsyncHTTPTransport(retries=3)
         self.async_client = AsyncOpenAI(
             api_key=api_key,
             base_url=base_url,
-            http_client=httpx.AsyncClient(transport=async_transport),
+            http_client=upstream_clients.get_async_client(base_url),
+            timeout=timeout,
             posthog_client=self.posthog,
         )
 
@@ -45,74 +52,28 @@ class OpenaiCompatibleProvider(GeneralProvider):
         )
         return response.content
 
-    def generate_text(
-        self, messages: List[Dict[str, Any]], request: ChatCompletionRequest
-    ):
-        """
-        Generates a non-streaming chat completion.
-        """
-        with tracer.start_as_current_span("openai_generate_text") as span:
-            if not request.model:
-                raise ValueError(
-                    "A model must be psecified for the OpenaiCompatibleProvider."
-                )
-
-            span.set_attribute("model", request.model)
-            span.set_attribute("message_count", len(messages))
-
-            # Prepare the request parameters
-            params = {
-                "model": request.model,
-                "messages": messages,
-                "stream": False,
-                **request.options,
-            }
-
-            if request.user_id:
-                params["posthog_distinct_id"] = request.user_id
-
-            # Add tool-related parameters if provided
-            if request.tools:
-                params["tools"] = [tool.model_dump() for tool in request.tools]
-                span.set_attribute("has_tools", True)
-            if request.tool_choice:
-                params["tool_choice"] = request.tool_choice
-
-            if request.reasoning is not None:
-                if isinstance(request.reasoning, bool):
-                    if not request.reasoning:
-                        params["reasoning"] = {"exclude": True}
-                else:
-                    reasoning_dict = request.reasoning.model_dump(exclude_none=True)
-                    if reasoning_dict:
-                        params["reasoning"] = reasoning_dict
-
-            log.debug(
-                "OpenAI API call",
-                extra={"model": request.model, "message_count": len(messages)},
-            )
-            response = self.client.chat.completions.create(**params)
-            return response.model_dump()
-
-    async def generate_text_stream(
-        self, messages: List[Dict[str, Any]], request: ChatCompletionRequest
-    ) -> AsyncGenerator[Dict[str, Any], None]:
+    @staticmethod
+    def _build_params(
+        messages: List[Dict[str, Any]], request: ChatCompletionRequest, stream: bool
+    ) -> Dict[str, Any]:
         """
-        Generates a streaming chat completion.
-        Yields dict with 'content' and optionally 'tool_calls'.
+        Builds the chat.completions.create parameters shared by all call paths.
         """
         if not request.model:
             raise ValueError(
                 "A model must be specified for the OpenaiCompatibleProvider."
             )
 
-        # Prepare the request parameters
         params = {
             "model": request.model,
             "messages": messages,
-            "stream": True,
+            "stream": stream,
             **request.options,
         }
+        if stream:
+            # The final usage chunk gives streamed completions the same
+            # completion_tokens count as non-streaming ones.
+            params.setdefault("stream_options", {"include_usage": True})
 
         if request.user_id:
             params["posthog_distinct_id"] = request.user_id
@@ -132,33 +93,117 @@ class OpenaiCompatibleProvider(GeneralProvider):
                 if reasoning_dict:
                     params["reasoning"] = reasoning_dict
 
+        return params
+
+    @staticmethod
+    def _tool_call_delta(tool_call) -> Dict[str, Any]:
+        """
+        Same shape as `tool_call.model_dump()` without pydantic's
+        serializer, which is expensive at per-token rates.
+        """
+        function = tool_call.function
+        return {
+            "index": tool_call.index,
+            "id": tool_call.id,
+            "function": (
+                {"arguments": function.arguments, "name": function.name}
+                if function is not None
+                else None
+            ),
+            "type": tool_call.type,
+        }
+
+    def generate_text(
+        self, messages: List[Dict[str, Any]], request: ChatCompletionRequest
+    ):
+        """
+        Generates a non-streaming chat completion with the blocking client.
+        Prefer `generate_text_async` from async code.
+        """
+        with tracer.start_as_current_span("openai_generate_text") as span:
+            params = self._build_params(messages, request, stream=False)
+
+            span.set_attribute("model", request.model)
+            span.set_attribute("message_count", len(messages))
+            span.set_attribute("has_tools", bool(request.tools))
+
+            log.debug(
+                "OpenAI API call",
+                extra={"model": request.model, "message_count": len(messages)},
+            )
+            response = self.client.chat.completions.create(**params)
+            return response.model_dump()
+
+    async def generate_text_async(
+        self, messages: List[Dict[str, Any]], request: ChatCompletionRequest
+    ):
+        """
+        Generates a non-streaming chat completion without blocking the event loop.
+        """
+        with tracer.start_as_current_span("openai_generate_text_async") as span:
+            params = self._build_params(messages, request, stream=False)
+
+            span.set_attribute("model", request.model)
+            span.set_attribute("message_count", len(messages))
+            span.set_attribute("has_tools", bool(request.tools))
+
+            log.debug(
+                "OpenAI API call",
+                extra={"model": request.model, "message_count": len(messages)},
+            )
+            response = await self.async_client.chat.completions.create(**params)
+            return response.model_dump()
+
+    async def generate_text_stream(
+        self, messages: List[Dict[str, Any]], request: ChatCompletionRequest
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        Generates a streaming chat completion.
+        Yields dict with 'content' and optionally 'tool_calls'. The upstream
+        usage block, when reported, is yielded last as {'usage': {...}}.
+        """
+        params = self._build_params(messages, request, stream=True)
+
         stream = await self.async_client.chat.completions.create(**params)
+        usage = None
         async for chunk in stream:
-            delta = chunk.choices[0].delta
+            if chunk.usage is not None:
+                usage = chunk.usage.model_dump()
+            if not chunk.choices:
+                continue
+            choice = chunk.choices[0]
+            delta = choice.delta
 
             # Build response chunk
             chunk_data = {}
 
-            if delta.content:
-                # Sanitize content to remove invalid surrogates
-                content = delta.content
-                # Encode with surrogate replacement, then decode back
-                try:
-                    content = content.encode("utf-8", errors="replace").decode("utf-8")
-                except (UnicodeEncodeError, UnicodeDecodeError):
-                    # If encoding fails, use surrogatepass then replace
-                    content = content.encode("utf-8", errors="ignore").decode("utf-8")
+            content = delta.content
+            if content:
+                # Only non-ASCII text can carry invalid surrogates; ASCII (the
+                # bulk of tokens) skips the encode round-trip entirely.
+                if not content.isascii():
+                    try:
+                        content.encode("utf-8")
+                    except UnicodeEncodeError:
+                        content = content.encode("utf-8", errors="replace").decode(
+                            "utf-8"
+                        )
                 chunk_data["content"] = content
 
             if delta.tool_calls:
-                chunk_data["tool_calls"] = [tc.model_dump() for tc in delta.tool_calls]
+                chunk_data["tool_calls"] = [
+                    self._tool_call_delta(tc) for tc in delta.tool_calls
+                ]
 
             if delta.role:
                 chunk_data["role"] = delta.role
 
-            if chunk.choices[0].finish_reason:
-                chunk_data["finish_reason"] = chunk.choices[0].finish_reason
+            if choice.finish_reason:
+                chunk_data["finish_reason"] = choice.finish_reason
 
             # Only yield if there's actual data
             if chunk_data:
                 yield chunk_data
+
+        if usage is not None:
+            yield {"usage": usage}
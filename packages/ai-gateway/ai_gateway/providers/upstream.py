@@ -0,0 +1,123 @@
+import logging
+import threading
+from typing import Dict, Optional
+
+import httpx
+
+from ..config import settings
+
+log = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401  # enables httpx's HTTP/2 support when installed
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class UpstreamClients:
+    """
+    Gateway-wide registry of pooled httpx clients, one sync and one async
+    client per upstream origin (scheme://host:port). Every provider shares
+    these so connections (and TLS sessions) are reused across requests.
+
+    HTTP/2 is negotiated when enabled and the `h2` package is installed;
+    otherwise clients fall back to HTTP/1.1 keep-alive.
+    """
+
+    def __init__(
+        self,
+        http2: bool = True,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        connect_timeout: float = 5.0,
+        timeout: float = 60.0,
+        retries: int = 3,
+    ):
+        self.http2_requested = http2
+        self.http2 = http2 and HTTP2_AVAILABLE
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.retries = retries
+        self._clients: Dict[str, httpx.Client] = {}
+        self._async_clients: Dict[str, httpx.AsyncClient] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def origin(url: Optional[str]) -> str:
+        parsed = httpx.URL(url or "https://api.openai.com/v1")
+        port = parsed.port or (443 if parsed.scheme == "https" else 80)
+        return f"{parsed.scheme}://{parsed.host}:{port}"
+
+    def get_client(self, url: Optional[str]) -> httpx.Client:
+        """Pooled sync client for the origin of `url`."""
+        key = self.origin(url)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = httpx.Client(
+                    timeout=self.timeout,
+                    transport=httpx.HTTPTransport(
+                        http2=self.http2, limits=self.limits, retries=self.retries
+                    ),
+                )
+                self._clients[key] = client
+                log.info(
+                    "Upstream client created",
+                    extra={"origin": key, "http2": self.http2, "mode": "sync"},
+                )
+            return client
+
+    def get_async_client(self, url: Optional[str]) -> httpx.AsyncClient:
+        """Pooled async client for the origin of `url`."""
+        key = self.origin(url)
+        with self._lock:
+            client = self._async_clients.get(key)
+            if client is None:
+                client = httpx.AsyncClient(
+                    timeout=self.timeout,
+                    transport=httpx.AsyncHTTPTransport(
+                        http2=self.http2, limits=self.limits, retries=self.retries
+                    ),
+                )
+                self._async_clients[key] = client
+                log.info(
+                    "Upstream client created",
+                    extra={"origin": key, "http2": self.http2, "mode": "async"},
+                )
+            return client
+
+    def log_startup(self) -> None:
+        """Report the negotiated protocol once; called on application startup."""
+        if self.http2_requested and not self.http2:
+            log.warning(
+                "HTTP/2 requested but the 'h2' package is not installed; "
+                "upstream clients will use HTTP/1.1"
+            )
+        else:
+            log.info("Upstream clients ready", extra={"http2": self.http2})
+
+    async def aclose(self) -> None:
+        """Close every pooled connection; called on application shutdown."""
+        for client in self._async_clients.values():
+            await client.aclose()
+        for client in self._clients.values():
+            client.close()
+        self._async_clients.clear()
+        self._clients.clear()
+
+
+upstream_clients = UpstreamClients(
+    http2=settings.upstream_http2,
+    max_connections=settings.upstream_max_connections_per_host,
+    max_keepalive_connections=settings.upstream_max_keepalive_per_host,
+    keepalive_expiry=settings.upstream_keepalive_expiry,
+    connect_timeout=settings.upstream_connect_timeout,
+    timeout=settings.upstream_timeout,
+)
@@ -1,9 +1,10 @@
+import asyncio
 import json
 import time
 import uuid
 import logging
 from pathlib import Path
-from typing import AsyncGenerator, Optional
+from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
 
 from openai import APIStatusError
 from opentelemetry import trace
@@ -19,69 +20,392 @@ from ..prompts.registry import (
 from ..prompts import prompt_registry
 
 from ..schemas import (
+    ChatCompletionBatchError,
+    ChatCompletionBatchItem,
+    ChatCompletionBatchRequest,
+    ChatCompletionBatchResponse,
     ChatCompletionRequest,
     ChatCompletionResponse,
+    ChatMessage,
 )
 from ..providers.base import GeneralProvider
-from ai_gateway.providers import general_providers
+from ..cache import (
+    completion_cache,
+    history_summary_cache,
+    semantic_cache,
+    single_flight,
+)
+from ..config import settings
+from ..context import chat_model_capabilities, history_compactor
+from ..context.budget import ContextBudget, ContextBudgetPolicy
+from ..context.tokenizer import get_token_counter
+from ..routing import model_router, model_stats
+from ..sse import (
+    SSE_DONE,
+    SSEChunkEncoder,
+    StreamMeter,
+    coalesce_deltas,
+    safe_dumps,
+)
+from ..vectors import truncate_and_normalize
+from .embedding import generate_embeddings_cached
+from ai_gateway.providers import general_providers, get_embedding_provider
 
 router = APIRouter()
 log = logging.getLogger(__name__)
 tracer = trace.get_tracer(__name__)
 
+# Per-provider caps on concurrent upstream calls made by batch requests.
+_batch_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+
+def batch_semaphore(provider_name: str) -> asyncio.Semaphore:
+    semaphore = _batch_semaphores.get(provider_name)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(max(1, settings.chat_batch_provider_concurrency))
+        _batch_semaphores[provider_name] = semaphore
+    return semaphore
+
+
+def render_messages(
+    request: ChatCompletionRequest, prompt_vars: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    """The rendered prompt template (if any) followed by the request's messages."""
+    base_messages = []
+    if request.prompt_type:
+        rendered = prompt_registry.render(
+            prompt_id=request.prompt_type,
+            version=request.prompt_version,
+            vars=prompt_vars,
+        )
+        if rendered.get("form") == "messages":
+            base_messages = rendered["messages"]
+        else:
+            base_messages = [{"role": "user", "content": rendered["prompt"]}]
+
+    user_messages = []
+    if request.messages:
+        user_messages = [msg.model_dump() for msg in request.messages]
+
+    return base_messages + user_messages
+
+
+def prompt_meta(request: ChatCompletionRequest) -> Dict[str, Any]:
+    if not request.prompt_type:
+        return {}
+    try:
+        return prompt_registry.get_entry(request.prompt_type, request.prompt_version).meta
+    except PromptNotFound:
+        return {}
+
+
+def context_models(request: ChatCompletionRequest) -> List[str]:
+    """Models the request may be sent to: the tier's candidates for auto."""
+    if request.model:
+        return [request.model]
+    if request.provider == "auto":
+        complexity = prompt_meta(request).get("complexity", "default")
+        return [model for _, model in model_router.candidates(complexity)]
+    return []
+
+
+def apply_context_budget(
+    request: ChatCompletionRequest, messages_dict: List[Dict[str, Any]]
+) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """
+    Trims the request to the context window of its model(s), minus the
+    completion's share, using the prompt's declared `meta.context_budget`
+    policy. Returns the messages to send and the token report, or the
+    messages unchanged and None when a model is not in the capability table.
+    """
+    capability = chat_model_capabilities.resolve(context_models(request))
+    if capability is None:
+        return messages_dict, None
+    policy = ContextBudgetPolicy.from_meta(prompt_meta(request))
+    reserve = (
+        request.options.get("max_tokens")
+        or request.options.get("max_completion_tokens")
+        or policy.reserve_output_tokens
+        or capability.max_output_tokens
+    )
+    budget = ContextBudget(
+        get_token_counter(capability.tokenizer),
+        limit=max(1, capability.context_window - int(reserve)),
+        policy=policy,
+        render=(
+            (lambda prompt_vars: render_messages(request, prompt_vars))
+            if request.prompt_type
+            else None
+        ),
+        prompt_vars=request.prompt_vars,
+    )
+    return budget.fit(messages_dict)
+
+
+async def summarize_history(
+    request: ChatCompletionRequest,
+    previous_summary: Optional[str],
+    turns: List[Dict[str, Any]],
+) -> str:
+    """One compaction step: folds `turns` into the rolling summary."""
+    summary_request = ChatCompletionRequest(
+        provider=settings.chat_compaction_provider,
+        model=settings.chat_compaction_model,
+        prompt_type="history_summary",
+        prompt_vars={"messages": turns, "previous_summary": previous_summary or ""},
+        options={"temperature": 0},
+        reasoning=False,
+        cache=False,
+        user_id=request.user_id,
+    )
+    response = await create_chat_completion(summary_request)
+    content = (response.choices[0].get("message") or {}).get("content")
+    if not content:
+        raise ValueError("The summarizer returned an empty summary")
+    return content.strip()
+
+
+async def compact_request_history(
+    request: ChatCompletionRequest,
+) -> Tuple[ChatCompletionRequest, Optional[Dict[str, Any]]]:
+    """
+    The request with its older `messages` replaced by the rolling summary.
+    Compaction is best-effort: on failure the full history is sent.
+    """
+    tokenizer = chat_model_capabilities.tokenizer_for(context_models(request))
+    try:
+        compacted, report = await history_compactor.compact(
+            [msg.model_dump() for msg in request.messages],
+            get_token_counter(tokenizer),
+            lambda summary, turns: summarize_history(request, summary, turns),
+        )
+    except Exception as e:
+        log.warning(
+            "History compaction failed, sending the full history",
+            extra={"error": str(e)},
+        )
+        return request, None
+    if report is None:
+        return request, None
+    messages = [ChatMessage(**message) for message in compacted]
+    return request.model_copy(update={"messages": messages}), report
+
+
+def context_headers(report: Optional[Dict[str, Any]]) -> Dict[str, str]:
+    if not report:
+        return {}
+    return {
+        "X-Context-Original-Tokens": str(report["original_tokens"]),
+        "X-Context-Tokens": str(report["final_tokens"]),
+    }
+
+
+def completion_cache_key(
+    request: ChatCompletionRequest, messages_dict: List[Dict[str, Any]]
+) -> Optional[str]:
+    """
+    Cache key for this request, or None when it must not be cached.
+    Requests opt in explicitly with `cache: true`; otherwise only
+    deterministic (temperature 0) requests are cached.
+    """
+    if request.cache is False:
+        return None
+    if request.cache is None and request.options.get("temperature") != 0:
+        return None
+    return request_fingerprint(request, messages_dict)
+
+
+def request_fingerprint(
+    request: ChatCompletionRequest, messages_dict: List[Dict[str, Any]]
+) -> str:
+    """Digest of every request field that determines the completion."""
+    reasoning = request.reasoning
+    if reasoning is not None and not isinstance(reasoning, bool):
+        reasoning = reasoning.model_dump(exclude_none=True)
+
+    return completion_cache.make_key(
+        prompt_type=request.prompt_type,
+        prompt_version=request.prompt_version,
+        messages=messages_dict,
+        provider=request.provider,
+        model=request.model,
+        options=request.options,
+        tools=[tool.model_dump() for tool in request.tools] if request.tools else None,
+        tool_choice=request.tool_choice,
+        reasoning=reasoning,
+    )
+
+
+def semantic_cache_threshold(request: ChatCompletionRequest) -> Optional[float]:
+    """
+    Cosine threshold declared by the prompt (`meta.semantic_cache.threshold`),
+    or None when the request is not eligible for the semantic cache.
+    """
+    if request.cache is False or not request.prompt_type:
+        return None
+    if not semantic_cache.enabled:
+        return None
+    try:
+        entry = prompt_registry.get_entry(request.prompt_type, request.prompt_version)
+    except PromptNotFound:
+        return None
+    config = entry.meta.get("semantic_cache")
+    if not isinstance(config, dict) or config.get("threshold") is None:
+        return None
+    return float(config["threshold"])
+
+
+async def embed_rendered_prompt(
+    messages_dict: List[Dict[str, Any]],
+) -> Optional[List[float]]:
+    """
+    Embed the rendered conversation with the gateway's own embedding
+    provider. Failures only disable the semantic cache for this request.
+    """
+    text = "\n\n".join(
+        f"{message.get('role')}: {message.get('content') or ''}"
+        for message in messages_dict
+    )
+    provider_name = settings.chat_semantic_cache_provider
+    model_name = settings.chat_semantic_cache_model
+    dimensions = settings.chat_semantic_cache_dimensions
+    try:
+        response = await generate_embeddings_cached(
+            get_embedding_provider(provider_name),
+            provider_name,
+            model_name,
+            [text],
+            {"dimensions": dimensions} if dimensions else {},
+        )
+        vector = response.data[0]["embedding"]
+        if dimensions and len(vector) > dimensions:
+            vector = truncate_and_normalize(vector, dimensions)
+        return vector
+    except Exception as e:
+        log.warning(
+            "Semantic cache embedding failed",
+            extra={"error": str(e), "provider": provider_name},
+        )
+        return None
+
+
+def cached_completion(
+    cached: Dict[str, Any], context_report: Optional[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    Rebuilds a cached completion for the current request: it gets its own id
+    and creation time, and carries this request's context report rather than
+    the one stored with the original response.
+    """
+    return {
+        **cached,
+        "id": f"chatcmpl-{uuid.uuid4()}",
+        "created": int(time.time()),
+        "context": context_report,
+    }
+
+
+async def replay_cached_response(
+    cached: Dict[str, Any],
+) -> AsyncGenerator[str, None]:
+    """
+    Replays a cached non-streaming completion (see `cached_completion`) as an
+    SSE stream: one chunk carrying the whole message, one carrying the finish
+    reason, then [DONE].
+    """
+    encoder = SSEChunkEncoder(cached["id"], cached["created"], cached.get("model"))
+    choice = (cached.get("choices") or [{}])[0]
+    message = choice.get("message") or {}
+
+    delta = {"role": message.get("role") or "assistant"}
+    if message.get("content"):
+        delta["content"] = message["content"]
+    if message.get("tool_calls"):
+        delta["tool_calls"] = [
+            {"index": i, **tool_call}
+            for i, tool_call in enumerate(message["tool_calls"])
+        ]
+
+    yield encoder.encode(delta)
+    yield encoder.encode({}, choice.get("finish_reason") or "stop")
+    yield SSE_DONE
+
 
 async def stream_provider_response(
     provider: GeneralProvider, request: ChatCompletionRequest, messages_dict: list
-) -> AsyncGenerator[str, None]:
+) -> AsyncGenerator[bytes, None]:
     """
     Calls the provider's streaming method and formats the output as SSE.
-    Supports both text content and tool calls.
+    Supports both text content and tool calls. Content deltas can be
+    coalesced into one event per `stream_coalesce_ms` window.
     """
     completion_id = f"chatcmpl-{uuid.uuid4()}"
     created_time = int(time.time())
+    # Built on the first chunk: the auto provider only sets request.model
+    # once it has selected a model.
+    encoder: Optional[SSEChunkEncoder] = None
+    coalesce_ms = (
+        request.stream_coalesce_ms
+        if request.stream_coalesce_ms is not None
+        else settings.chat_stream_coalesce_ms
+    )
+    span = trace.get_current_span()
+    coalescing = bool(coalesce_ms and coalesce_ms > 0)
+    meter = StreamMeter()
+    event_count = 0
 
     try:
-        async for chunk_data_raw in provider.generate_text_stream(
+        chunks = provider.generate_text_stream(
             messages=messages_dict, request=request
-        ):
-            # Build the delta object from the chunk
-            delta = {}
-            finish_reason = chunk_data_raw.get("finish_reason")
-
-            if "content" in chunk_data_raw:
-                delta["content"] = chunk_data_raw["content"]
-
-            if "tool_calls" in chunk_data_raw:
-                delta["tool_calls"] = chunk_data_raw["tool_calls"]
+        )
+        if coalescing:
+            chunks = coalesce_deltas(chunks, coalesce_ms, meter)
+
+        async for chunk_data_raw in chunks:
+            if "usage" in chunk_data_raw:
+                # Upstream token accounting, not part of the client's stream.
+                continue
+            started = time.thread_time()
+            if not coalescing:
+                meter.deltas += 1
+            if encoder is None:
+                encoder = SSEChunkEncoder(completion_id, created_time, request.model)
+            if chunk_data_raw.keys() == {"content"}:
+                event = encoder.encode_content(chunk_data_raw["content"])
+            else:
+                # Build the delta object from the chunk
+                delta = {}
+                if "content" in chunk_data_raw:
+                    delta["content"] = chunk_data_raw["content"]
+                if "tool_calls" in chunk_data_raw:
+                    delta["tool_calls"] = chunk_data_raw["tool_calls"]
+                if "role" in chunk_data_raw:
+                    delta["role"] = chunk_data_raw["role"]
+                event = encoder.encode(delta, chunk_data_raw.get("finish_reason"))
+            event_count += 1
+            meter.cpu_seconds += time.thread_time() - started
+            yield event
 
-            if "role" in chunk_data_raw:
-                delta["role"] = chunk_data_raw["role"]
+        # Send the final DONE message
+        yield SSE_DONE
 
-            chunk_data = {
-                "id": completion_id,
-                "object": "chat.completion.chunk",
-                "created": created_time,
+        # Providers stream one delta per generated token, so upstream deltas
+        # (counted before coalescing) are the per-token divisor.
+        cpu_us_per_token = (
+            meter.cpu_seconds * 1e6 / meter.deltas if meter.deltas else 0.0
+        )
+        span.set_attribute("stream.deltas", meter.deltas)
+        span.set_attribute("stream.events", event_count)
+        span.set_attribute("stream.cpu_us_per_token", cpu_us_per_token)
+        log.info(
+            "Chat stream finished",
+            extra={
                 "model": request.model,
-                "choices": [
-                    {
-                        "index": 0,
-                        "delta": delta,
-                        "finish_reason": finish_reason,
-                    }
-                ],
-            }
-            # Format as Server-Sent Event (SSE)
-            try:
-                # Ensure proper UTF-8 encoding without replacement characters
-                json_str = json.dumps(chunk_data, ensure_ascii=False)
-                yield f"data: {json_str}\n\n"
-            except (UnicodeEncodeError, UnicodeDecodeError, TypeError) as e:
-                # If encoding fails, use ASCII-safe encoding
-                json_str = json.dumps(chunk_data, ensure_ascii=True)
-                yield f"data: {json_str}\n\n"
-
-        # Send the final DONE message
-        yield "data: [DONE]\n\n"
+                "deltas": meter.deltas,
+                "events": event_count,
+                "cpu_us_per_token": round(cpu_us_per_token, 2),
+            },
+        )
 
     except Exception as e:
         error_msg = (
@@ -90,11 +414,11 @@ async def stream_provider_response(
         error_data = {"error": error_msg}
         try:
             # Safely encode the error message
-            yield f"data: {json.dumps(error_data, ensure_ascii=True)}\n\n"
+            yield b"data: " + safe_dumps(error_data) + b"\n\n"
         except Exception:
             # Ultimate fallback with safe string
-            yield f"data: {json.dumps({'error': 'An error occurred during streaming'})}\n\n"
-        yield "data: [DONE]\n\n"
+            yield f"data: {json.dumps({'error': 'An error occurred during streaming'})}\n\n".encode()
+        yield SSE_DONE
 
 
 @router.post("/v1/chat/completions")
@@ -127,29 +451,26 @@ async def create_chat_completion(request: ChatCompletionRequest):
             },
         )
 
-        base_messages = []
-        user_messages = []
+        compaction_report = None
+        if request.compact_history and request.messages:
+            request, compaction_report = await compact_request_history(request)
+            if compaction_report is not None:
+                span.set_attribute("compaction.original_tokens", compaction_report["original_tokens"])
+                span.set_attribute("compaction.tokens", compaction_report["compacted_tokens"])
+                span.set_attribute("compaction.summary_cached", compaction_report["summary_cached"])
 
-        if request.prompt_type:
-            try:
-                rendered = prompt_registry.render(
-                    prompt_id=request.prompt_type,
-                    version=request.prompt_version,
-                    vars=request.prompt_vars,
+        context_report = None
+        try:
+            messages_dict = render_messages(request, request.prompt_vars)
+            if messages_dict and settings.chat_context_budget_enabled:
+                # Variable policies re-render the prompt, hence inside the try.
+                messages_dict, context_report = apply_context_budget(
+                    request, messages_dict
                 )
-                if rendered.get("form") == "messages":
-                    base_messages = rendered["messages"]
-                else:
-                    base_messages = [{"role": "user", "content": rendered["prompt"]}]
-            except (PromptNotFound, PromptRenderError, PromptValidationError) as e:
-                log.warning("Prompt error", extra={"error": str(e), "prompt_type": request.prompt_type})
-                span.set_attribute("error", True)
-                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
-
-        if request.messages:
-            user_messages = [msg.model_dump() for msg in request.messages]
-
-        messages_dict = base_messages + user_messages
+        except (PromptNotFound, PromptRenderError, PromptValidationError) as e:
+            log.warning("Prompt error", extra={"error": str(e), "prompt_type": request.prompt_type})
+            span.set_attribute("error", True)
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
         if not messages_dict:
             raise HTTPException(
@@ -157,18 +478,91 @@ async def create_chat_completion(request: ChatCompletionRequest):
                 detail="Either 'messages' or 'prompt_type' must be provided.",
             )
 
+        if context_report is not None:
+            if compaction_report is not None:
+                context_report["compaction"] = compaction_report
+            span.set_attribute("context.original_tokens", context_report["original_tokens"])
+            span.set_attribute("context.tokens", context_report["final_tokens"])
+            span.set_attribute("context.limit", context_report["limit"])
+            span.set_attribute("context.tokenizer", context_report["tokenizer"])
+            if context_report["trimmed"]:
+                span.set_attribute("context.policy", context_report["policy"])
+                log.info("Trimmed chat context to the token budget", extra=context_report)
+
+        cache_key = completion_cache_key(request, messages_dict)
+        cached = completion_cache.get(cache_key) if cache_key else None
+        span.set_attribute("cache_hit", cached is not None)
+
+        semantic_partition = semantic_vector = None
+        semantic_threshold = (
+            semantic_cache_threshold(request) if cached is None else None
+        )
+        if semantic_threshold is not None:
+            semantic_vector = await embed_rendered_prompt(messages_dict)
+            if semantic_vector is not None:
+                semantic_partition = request_fingerprint(request, [])
+                match = semantic_cache.lookup(
+                    semantic_partition, semantic_vector, semantic_threshold
+                )
+                if match is not None:
+                    cached, similarity = match
+                    span.set_attribute("semantic_cache_hit", True)
+                    span.set_attribute("semantic_cache_similarity", similarity)
+
+        if cached is not None:
+            log.info(
+                "Chat completion cache hit",
+                extra={
+                    "prompt_type": request.prompt_type,
+                    "stream": request.stream,
+                    "semantic": semantic_vector is not None,
+                },
+            )
+            cached = cached_completion(cached, context_report)
+            if request.stream:
+                return StreamingResponse(
+                    replay_cached_response(cached),
+                    media_type="text/event-stream",
+                    headers=context_headers(context_report),
+                )
+            return ChatCompletionResponse(**cached)
+
+        # Identical deterministic requests already in flight share their
+        # upstream call (or stream) instead of sending another.
+        flight_key = None
+        if cache_key:
+            flight_key = single_flight.make_key(
+                "chat_stream" if request.stream else "chat", cache_key
+            )
+            span.set_attribute(
+                "single_flight.shared", single_flight.in_flight(flight_key)
+            )
+
         if request.stream:
             return StreamingResponse(
-                stream_provider_response(
-                    general_providers[request.provider], request, messages_dict
+                single_flight.stream(
+                    flight_key,
+                    lambda: stream_provider_response(
+                        general_providers[request.provider], request, messages_dict
+                    ),
                 ),
                 media_type="text/event-stream",
+                headers=context_headers(context_report),
             )
         else:
             try:
-                response_data = general_providers[request.provider].generate_text(
-                    messages=messages_dict, request=request
-                )
+                provider = general_providers[request.provider]
+
+                async def call_upstream() -> Dict[str, Any]:
+                    # Prompts with `meta.hedge` are hedged across models by
+                    # the auto provider, which has the latency statistics.
+                    return await provider.generate_text_async(
+                        messages=messages_dict, request=request
+                    )
+
+                # Shallow copy: the result may be shared with other callers,
+                # and only top-level keys are replaced below.
+                response_data = dict(await single_flight.do(flight_key, call_upstream))
 
                 if "usage" in response_data:
                     usage = response_data["usage"]
@@ -208,7 +602,18 @@ async def create_chat_completion(request: ChatCompletionRequest):
                     }
 
                 log.info("Chat completion success", extra={"provider": request.provider, "model": request.model})
-                return ChatCompletionResponse(**response_data)
+                response = ChatCompletionResponse(**response_data, context=context_report)
+                if cache_key:
+                    completion_cache.put(cache_key, response.model_dump())
+                if semantic_vector is not None:
+                    # Neighbours reuse only the answer; id, created and the
+                    # context report are rebuilt per hit by cached_completion.
+                    semantic_cache.put(
+                        semantic_partition,
+                        semantic_vector,
+                        response.model_dump(exclude={"id", "created", "context"}),
+                    )
+                return response
 
             except APIStatusError as e:
                 log.error("API status error", extra={"status_code": e.status_code, "provider": request.provider})
@@ -225,6 +630,79 @@ async def create_chat_completion(request: ChatCompletionRequest):
                 )
 
 
+@router.post(
+    "/v1/chat/completions/batch", response_model=ChatCompletionBatchResponse
+)
+async def create_chat_completion_batch(batch: ChatCompletionBatchRequest):
+    """
+    Runs independent non-streaming completions concurrently, at most
+    `chat_batch_provider_concurrency` in flight per provider. Results are
+    returned in input order; a failing item carries its own error instead
+    of failing the whole batch.
+    """
+    with tracer.start_as_current_span("chat_completion_batch") as span:
+        span.set_attribute("batch_size", len(batch.requests))
+
+        if len(batch.requests) > settings.chat_batch_max_requests:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"A batch may contain at most {settings.chat_batch_max_requests} requests.",
+            )
+
+        async def run_item(index: int, request: ChatCompletionRequest):
+            if request.stream:
+                return ChatCompletionBatchItem(
+                    index=index,
+                    error=ChatCompletionBatchError(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail="Streaming is not supported in batch requests.",
+                    ),
+                )
+            try:
+                async with batch_semaphore(request.provider):
+                    response = await create_chat_completion(request)
+                return ChatCompletionBatchItem(index=index, response=response)
+            except HTTPException as e:
+                return ChatCompletionBatchItem(
+                    index=index,
+                    error=ChatCompletionBatchError(
+                        status_code=e.status_code, detail=e.detail
+                    ),
+                )
+
+        results = await asyncio.gather(
+            *(run_item(i, request) for i, request in enumerate(batch.requests))
+        )
+
+        failed = sum(1 for item in results if item.error is not None)
+        span.set_attribute("failed", failed)
+        log.info(
+            "Chat completion batch finished",
+            extra={"batch_size": len(results), "failed": failed},
+        )
+        return ChatCompletionBatchResponse(results=results)
+
+
+@router.get("/v1/chat/cache/stats")
+async def get_chat_cache_stats():
+    """Hit/miss/eviction counters for the chat response and history summary caches."""
+    return {
+        "exact": completion_cache.get_stats(),
+        "semantic": semantic_cache.get_stats(),
+        "history_summary": history_summary_cache.get_stats(),
+        "single_flight": {
+            "chat": single_flight.get_stats("chat"),
+            "chat_stream": single_flight.get_stats("chat_stream"),
+        },
+    }
+
+
+@router.get("/v1/chat/routing/stats")
+async def get_routing_stats():
+    """Per-model health statistics and the current candidate ranking per tier."""
+    return {"models": model_stats.snapshot(), "tiers": model_router.snapshot()}
+
+
 @router.get("/v1/prompts")
 async def list_prompts():
     """Lists all available prompt templates."""
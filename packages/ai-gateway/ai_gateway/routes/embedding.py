@@ -1,6 +1,11 @@
+import asyncio
+import base64
+import json
 import logging
+from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
 from opentelemetry import trace
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, status, Header, Response
+from fastapi.responses import StreamingResponse
 from ..schemas import (
     EmbeddingRequest,
     EmbeddingResponse,
@@ -9,7 +14,19 @@ from ..schemas import (
 )
 
 from ai_gateway.providers import get_embedding_provider
+from ..providers.base import EmbeddingProvider
+from ..cache import embedding_cache, single_flight
+from ..batching import embedding_batcher, embedding_planner
+from ..config import settings
 from ..models_registry import models_registry
+from ..vectors import (
+    encode_frame,
+    quantize_vectors,
+    truncate_and_normalize,
+    unpack_row,
+    QUANTIZATION_DTYPES,
+    VECTOR_FRAME_MEDIA_TYPE,
+)
 
 router = APIRouter()
 log = logging.getLogger(__name__)
@@ -37,8 +54,11 @@ def parse_full_model(full_model: str) -> tuple[str, str]:
     return provider, model
 
 
-@router.post("/v1/embeddings", response_model=EmbeddingResponse)
-async def create_embedding(request: EmbeddingRequest):
+def resolve_provider_and_model(request: EmbeddingRequest) -> tuple[str, str]:
+    """
+    Resolve (provider, model) from either `fullModel` or the explicit fields.
+    Raises HTTPException(400) if either part is missing or malformed.
+    """
     provider_name = request.provider
     model_name = request.model
 
@@ -63,6 +83,169 @@ async def create_embedding(request: EmbeddingRequest):
             detail="Model is required for embedding requests.",
         )
 
+    return provider_name, model_name
+
+
+def resolve_dimensions(
+    request: EmbeddingRequest, provider_name: str, model_name: str
+) -> tuple[Dict[str, Any], Optional[int]]:
+    """
+    Validate the requested Matryoshka size against the registry.
+    Returns (provider options, target dimensions). Providers that support
+    native truncation get `dimensions` in their options; the gateway still
+    truncates and renormalizes whatever comes back.
+    """
+    if request.dimensions is None:
+        return request.options, None
+    try:
+        models_registry.validate_dimensions(
+            provider_name, model_name, request.dimensions
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    options = request.options
+    if models_registry.get_capabilities(provider_name, model_name).get(
+        "nativeDimensions"
+    ):
+        options = {**options, "dimensions": request.dimensions}
+    return options, request.dimensions
+
+
+def apply_dimensions(response: EmbeddingResponse, dimensions: Optional[int]) -> None:
+    """Truncate and L2-renormalize vectors longer than `dimensions` in place."""
+    if dimensions is None:
+        return
+    for item in response.data:
+        if len(item["embedding"]) > dimensions:
+            item["embedding"] = truncate_and_normalize(item["embedding"], dimensions)
+
+
+async def generate_embeddings_cached(
+    provider: EmbeddingProvider,
+    provider_name: str,
+    model_name: str,
+    texts: List[str],
+    options: Dict[str, Any],
+) -> EmbeddingResponse:
+    """
+    Serve embeddings from the cache where possible and only send the
+    missing (deduplicated) texts to the provider.
+    """
+    keys = [
+        embedding_cache.make_key(provider_name, model_name, options, text)
+        for text in texts
+    ]
+    vectors = await embedding_cache.get_many(keys)
+
+    # Deduplicate misses so repeated chunks in one request are embedded once.
+    miss_texts: Dict[str, str] = {}
+    for key, text in zip(keys, texts):
+        if key not in vectors:
+            miss_texts.setdefault(key, text)
+
+    response_model = model_name
+    usage = {"prompt_tokens": 0, "total_tokens": 0}
+    if miss_texts:
+        miss_keys = list(miss_texts.keys())
+
+        async def embed_misses() -> Tuple[Dict[str, List[float]], str, Any]:
+            if settings.embedding_microbatch_enabled and len(miss_texts) == 1:
+                (text,) = miss_texts.values()
+                response = await embedding_batcher.embed(
+                    provider, provider_name, model_name, options, text
+                )
+            else:
+                response = await embedding_planner.embed(
+                    provider,
+                    provider_name,
+                    model_name,
+                    list(miss_texts.values()),
+                    options,
+                    models_registry.get_capabilities(provider_name, model_name),
+                )
+            fresh = {}
+            for item in response.data:
+                fresh[miss_keys[item["index"]]] = item["embedding"]
+            if len(fresh) != len(miss_keys):
+                raise ValueError(
+                    f"Provider returned {len(fresh)} embeddings for {len(miss_keys)} inputs"
+                )
+            await embedding_cache.put_many(fresh)
+            return fresh, response.model or model_name, response.usage
+
+        # Cache keys already cover provider, model, options and text.
+        fresh, response_model, usage = await single_flight.do(
+            single_flight.make_key("embedding", miss_keys), embed_misses
+        )
+        vectors.update(fresh)
+
+    return EmbeddingResponse(
+        provider=provider_name,
+        model=response_model,
+        data=[
+            {"object": "embedding", "embedding": vectors[key], "index": i}
+            for i, key in enumerate(keys)
+        ],
+        usage=usage,
+    )
+
+
+def encode_embedding_response(
+    response: EmbeddingResponse,
+    encoding_format: str,
+    quantization: Optional[str] = None,
+    calibration: Optional[Dict[str, Any]] = None,
+) -> Any:
+    """
+    Render an EmbeddingResponse in the negotiated quantization and encoding.
+    The binary frame carries provider, model, usage and quantization
+    parameters in response headers.
+    """
+    if quantization is None and encoding_format == "float":
+        return response.model_dump()
+
+    vectors = [item["embedding"] for item in response.data]
+    rows, params = quantize_vectors(vectors, quantization, calibration)
+
+    if encoding_format == "binary":
+        headers = {
+            "X-Embedding-Provider": response.provider,
+            "X-Embedding-Model": response.model,
+            "X-Usage-Prompt-Tokens": str(response.usage.get("prompt_tokens", 0)),
+            "X-Usage-Total-Tokens": str(response.usage.get("total_tokens", 0)),
+        }
+        if params and params["type"] == "int8":
+            headers["X-Quantization-Scale"] = repr(params["scale"])
+            headers["X-Quantization-Offset"] = repr(params["offset"])
+        return Response(
+            content=encode_frame(
+                rows,
+                len(vectors[0]) if vectors else 0,
+                QUANTIZATION_DTYPES[quantization],
+            ),
+            media_type=VECTOR_FRAME_MEDIA_TYPE,
+            headers=headers,
+        )
+
+    for item, row in zip(response.data, rows):
+        if encoding_format == "base64":
+            item["embedding"] = base64.b64encode(row).decode("ascii")
+        else:
+            item["embedding"] = unpack_row(row, quantization)
+    response.quantization = params
+    return response.model_dump()
+
+
+@router.post("/v1/embeddings", response_model=EmbeddingResponse)
+async def create_embedding(
+    request: EmbeddingRequest, accept: Optional[str] = Header(default=None)
+):
+    provider_name, model_name = resolve_provider_and_model(request)
+    options, dimensions = resolve_dimensions(request, provider_name, model_name)
+
     with tracer.start_as_current_span("create_embedding") as span:
         span.set_attribute("provider", provider_name)
         span.set_attribute("model", model_name)
@@ -92,14 +275,31 @@ async def create_embedding(request: EmbeddingRequest):
             )
 
         try:
-            response = provider.generate_embeddings(
-                input_text=request.input, model=model_name, options=request.options
+            texts = [request.input] if isinstance(request.input, str) else request.input
+            response = await generate_embeddings_cached(
+                provider, provider_name, model_name, texts, options
             )
+            apply_dimensions(response, dimensions)
+            encoding_format = request.encoding_format
+            if accept and VECTOR_FRAME_MEDIA_TYPE in accept:
+                encoding_format = "binary"
+
             log.info(
                 "Embedding success",
-                extra={"provider": provider_name, "model": model_name},
+                extra={
+                    "provider": provider_name,
+                    "model": model_name,
+                    "encoding_format": encoding_format,
+                },
+            )
+            return encode_embedding_response(
+                response,
+                encoding_format,
+                request.quantization,
+                models_registry.get_calibration(
+                    provider_name, model_name, request.quantization, dimensions
+                ),
             )
-            return response.model_dump()
         except Exception as e:
             log.error(
                 "Embedding error", extra={"error": str(e), "provider": provider_name}
@@ -112,6 +312,171 @@ async def create_embedding(request: EmbeddingRequest):
             )
 
 
+async def stream_embedding_batches(
+    provider: EmbeddingProvider,
+    provider_name: str,
+    model_name: str,
+    texts: List[str],
+    options: Dict[str, Any],
+    encoding_format: str,
+    quantization: Optional[str] = None,
+    calibration: Optional[Dict[str, Any]] = None,
+    dimensions: Optional[int] = None,
+) -> AsyncGenerator[str, None]:
+    """
+    Embed `texts` in sub-batches and emit one NDJSON line per vector as soon
+    as its sub-batch completes. At most `embedding_stream_concurrency`
+    sub-batches are in flight, which also bounds buffered results.
+
+    Lines are {"index": i, "embedding": ...}; the last line is either
+    {"done": true, "provider", "model", "usage"} or {"error": "..."}.
+    """
+    batch_size = max(1, settings.embedding_stream_batch_size)
+    offsets = iter(range(0, len(texts), batch_size))
+    in_flight: Dict[asyncio.Task, int] = {}
+    usage = {"prompt_tokens": 0, "total_tokens": 0}
+    response_model = model_name
+
+    def launch_next() -> bool:
+        offset = next(offsets, None)
+        if offset is None:
+            return False
+        task = asyncio.create_task(
+            generate_embeddings_cached(
+                provider,
+                provider_name,
+                model_name,
+                texts[offset : offset + batch_size],
+                options,
+            )
+        )
+        in_flight[task] = offset
+        return True
+
+    with tracer.start_as_current_span("stream_embeddings") as span:
+        span.set_attribute("provider", provider_name)
+        span.set_attribute("model", model_name)
+        span.set_attribute("input_count", len(texts))
+
+        try:
+            for _ in range(max(1, settings.embedding_stream_concurrency)):
+                if not launch_next():
+                    break
+
+            while in_flight:
+                done, _ = await asyncio.wait(
+                    in_flight.keys(), return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    offset = in_flight.pop(task)
+                    response = task.result()
+                    apply_dimensions(response, dimensions)
+                    vectors = [item["embedding"] for item in response.data]
+                    if quantization is None and encoding_format == "float":
+                        rows, params = [None] * len(vectors), None
+                    else:
+                        rows, params = quantize_vectors(
+                            vectors, quantization, calibration
+                        )
+                    for item, row in zip(response.data, rows):
+                        if encoding_format == "base64":
+                            embedding = base64.b64encode(row).decode("ascii")
+                        elif quantization is None:
+                            embedding = item["embedding"]
+                        else:
+                            embedding = unpack_row(row, quantization)
+                        line = {"index": offset + item["index"], "embedding": embedding}
+                        if params:
+                            line["quantization"] = params
+                        yield json.dumps(line) + "\n"
+                    for name in usage:
+                        usage[name] += response.usage.get(name, 0)
+                    response_model = response.model or response_model
+                    launch_next()
+
+            yield json.dumps(
+                {
+                    "done": True,
+                    "provider": provider_name,
+                    "model": response_model,
+                    "usage": usage,
+                }
+            ) + "\n"
+
+        except Exception as e:
+            log.error(
+                "Embedding stream error",
+                extra={"error": str(e), "provider": provider_name},
+            )
+            span.set_attribute("error", True)
+            span.record_exception(e)
+            yield json.dumps(
+                {"error": f"An error occurred with the '{provider_name}' provider: {e}"}
+            ) + "\n"
+        finally:
+            for task in in_flight:
+                task.cancel()
+
+
+@router.post("/v1/embeddings/stream")
+async def create_embedding_stream(request: EmbeddingRequest):
+    """
+    Streaming variant of /v1/embeddings for large inputs. Responds with
+    NDJSON, emitting vectors as each upstream sub-batch completes.
+    """
+    provider_name, model_name = resolve_provider_and_model(request)
+    options, dimensions = resolve_dimensions(request, provider_name, model_name)
+
+    if request.encoding_format == "binary":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="The streaming endpoint supports 'float' and 'base64' encodings only.",
+        )
+
+    try:
+        provider = get_embedding_provider(provider_name)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+    texts = [request.input] if isinstance(request.input, str) else request.input
+    log.info(
+        "Embedding stream request",
+        extra={
+            "provider": provider_name,
+            "model": model_name,
+            "input_count": len(texts),
+        },
+    )
+    return StreamingResponse(
+        stream_embedding_batches(
+            provider,
+            provider_name,
+            model_name,
+            texts,
+            options,
+            request.encoding_format,
+            request.quantization,
+            models_registry.get_calibration(
+                provider_name, model_name, request.quantization, dimensions
+            ),
+            dimensions,
+        ),
+        media_type="application/x-ndjson",
+    )
+
+
+@router.get("/v1/embeddings/cache/stats")
+async def get_cache_stats():
+    """Hit/miss/eviction counters for the embedding cache."""
+    return {
+        **embedding_cache.get_stats(),
+        "single_flight": single_flight.get_stats("embedding"),
+    }
+
+
 @router.get("/v1/embeddings/models")
 async def get_available_models():
     """Get all available embedding models and the default model."""
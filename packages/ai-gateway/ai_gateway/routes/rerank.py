@@ -1,11 +1,15 @@
+import asyncio
 import logging
 from opentelemetry import trace
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Dict, List, Literal, Optional, Tuple
 
 from ..providers import get_embedding_provider
+from ..providers.base import EmbeddingProvider
+from ..cache import rerank_cache, single_flight
 from ..config import settings
+from ..lexical import adaptive_candidate_count, bm25_scores, top_candidates
 
 log = logging.getLogger(__name__)
 tracer = trace.get_tracer(__name__)
@@ -30,6 +34,14 @@ class RerankRequest(BaseModel):
     top_n: Optional[int] = Field(
         default=None, description="Return only the top N results"
     )
+    prefilter: Optional[bool] = Field(
+        default=None,
+        description="BM25 pre-ranking before the cross-encoder (server default if unset)",
+    )
+    max_candidates: Optional[int] = Field(
+        default=None,
+        description="Documents kept by the pre-ranker; chosen adaptively when unset",
+    )
 
 
 class RerankResult(BaseModel):
@@ -43,6 +55,131 @@ class RerankResponse(BaseModel):
     results: List[RerankResult]
 
 
+class RerankBatchRequest(BaseModel):
+    queries: List[str] = Field(
+        ..., description="Query variants to score against the shared documents"
+    )
+    documents: List[RerankDocument] = Field(
+        ..., description="Shared pool of documents to rerank"
+    )
+    model: Optional[str] = Field(
+        default="jina-reranker-v2-base-multilingual",
+        description="The reranking model to use",
+    )
+    top_n: Optional[int] = Field(
+        default=None, description="Return only the top N results per ranking"
+    )
+    fusion: Optional[Literal["rrf"]] = Field(
+        default="rrf",
+        description="Fuse per-query rankings (reciprocal rank fusion) or None",
+    )
+    rrf_k: int = Field(default=60, description="RRF damping constant")
+
+
+class RerankQueryResult(BaseModel):
+    query: str
+    results: List[RerankResult]
+
+
+class RerankBatchResponse(BaseModel):
+    model: str
+    rankings: List[RerankQueryResult]
+    fused: Optional[List[RerankResult]] = Field(
+        default=None,
+        description="Fused ranking; relevance_score holds the RRF score",
+    )
+
+
+async def score_documents(
+    provider: EmbeddingProvider, query: str, texts: List[str], model: str
+) -> Tuple[Dict[int, float], str]:
+    """
+    Score every text against the query, reusing cached scores and sending
+    only unseen (deduplicated) documents upstream. Returns
+    ({text index: relevance score}, model reported by the provider).
+    """
+    scores = rerank_cache.get_many(model, query, texts)
+    unseen = list(
+        dict.fromkeys(text for i, text in enumerate(texts) if i not in scores)
+    )
+
+    response_model = model
+    if unseen:
+
+        async def score_unseen() -> Tuple[Dict[str, float], str]:
+            # Score all unseen documents (no top_n) so every score can be cached.
+            rerank_response = await provider.rerank_async(
+                query=query, documents=unseen, model=model
+            )
+            fresh = {
+                unseen[result["index"]]: result["relevance_score"]
+                for result in rerank_response["results"]
+            }
+            rerank_cache.put_many(model, query, fresh)
+            return fresh, rerank_response.get("model", model)
+
+        fresh, response_model = await single_flight.do(
+            single_flight.make_key("rerank", model, query, unseen), score_unseen
+        )
+        for i, text in enumerate(texts):
+            if i not in scores:
+                scores[i] = fresh[text]
+
+    return scores, response_model
+
+
+def prefilter_candidates(request: RerankRequest) -> Optional[List[int]]:
+    """
+    Run the lexical first stage and return the indices of the documents to
+    send to the cross-encoder, or None when every document should be scored.
+    """
+    enabled = (
+        request.prefilter
+        if request.prefilter is not None
+        else settings.rerank_prefilter_enabled
+    )
+    num_documents = len(request.documents)
+    if not enabled or num_documents < settings.rerank_prefilter_min_documents:
+        return None
+
+    limit = request.max_candidates or settings.rerank_prefilter_max_candidates
+    if limit is None:
+        limit = adaptive_candidate_count(
+            num_documents, request.top_n, settings.rerank_prefilter_min_candidates
+        )
+    if request.top_n is not None:
+        limit = max(limit, request.top_n)
+    if limit >= num_documents:
+        return None
+
+    lexical = bm25_scores(request.query, [doc.text for doc in request.documents])
+    if not any(lexical):
+        # No lexical overlap at all: nothing to rank by, keep everything.
+        return None
+    return top_candidates(lexical, limit)
+
+
+def rank_scores(
+    scores: Dict[int, float], top_n: Optional[int] = None
+) -> List[Tuple[int, float]]:
+    """Sort (index, score) pairs by descending score and apply top_n."""
+    ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+    if top_n is not None:
+        ranked = ranked[:top_n]
+    return ranked
+
+
+def reciprocal_rank_fusion(
+    rankings: List[List[Tuple[int, float]]], k: int = 60
+) -> Dict[int, float]:
+    """Combine rankings with RRF: score(d) = sum over rankings of 1 / (k + rank)."""
+    fused: Dict[int, float] = {}
+    for ranking in rankings:
+        for rank, (index, _) in enumerate(ranking, start=1):
+            fused[index] = fused.get(index, 0.0) + 1.0 / (k + rank)
+    return fused
+
+
 @router.post("/v1/rerank", response_model=RerankResponse)
 async def rerank(request: RerankRequest):
     """
@@ -72,25 +209,39 @@ async def rerank(request: RerankRequest):
             # Get the Jina provider for reranking
             provider = get_embedding_provider("jina")
 
-            # Use the provider's rerank method
-            rerank_response = provider.rerank(
-                query=request.query,
-                documents=[doc.text for doc in request.documents],
-                model=request.model,
-                top_n=request.top_n,
+            candidates = prefilter_candidates(request)
+            if candidates is None:
+                candidates = list(range(len(request.documents)))
+            else:
+                span.set_attribute("prefilter_candidates", len(candidates))
+                log.info(
+                    "Rerank prefilter applied",
+                    extra={
+                        "num_documents": len(request.documents),
+                        "num_candidates": len(candidates),
+                    },
+                )
+
+            candidate_scores, response_model = await score_documents(
+                provider,
+                request.query,
+                [request.documents[i].text for i in candidates],
+                request.model,
             )
+            scores = {
+                candidates[position]: score
+                for position, score in candidate_scores.items()
+            }
 
             # Build response with original document metadata
-            results = []
-            for result in rerank_response["results"]:
-                original_index = result["index"]
-                results.append(
-                    RerankResult(
-                        index=original_index,
-                        relevance_score=result["relevance_score"],
-                        document=request.documents[original_index],
-                    )
+            results = [
+                RerankResult(
+                    index=index,
+                    relevance_score=score,
+                    document=request.documents[index],
                 )
+                for index, score in rank_scores(scores, request.top_n)
+            ]
 
             log.info(
                 "Rerank success",
@@ -100,9 +251,7 @@ async def rerank(request: RerankRequest):
                 },
             )
 
-            return RerankResponse(
-                model=rerank_response.get("model", request.model), results=results
-            )
+            return RerankResponse(model=response_model, results=results)
 
         except Exception as e:
             log.error(
@@ -113,3 +262,111 @@ async def rerank(request: RerankRequest):
             raise HTTPException(
                 status_code=500, detail=f"Failed to rerank documents: {str(e)}"
             )
+
+
+@router.post("/v1/rerank/batch", response_model=RerankBatchResponse)
+async def rerank_batch(request: RerankBatchRequest):
+    """
+    Rerank one shared document pool against several query variants (e.g. the
+    output of the multi_query prompt) in a single round-trip. Queries are
+    scored concurrently, duplicate queries and documents are sent upstream
+    once, and rankings can be fused with reciprocal rank fusion.
+    """
+    with tracer.start_as_current_span("rerank_batch") as span:
+        span.set_attribute("model", request.model)
+        span.set_attribute("num_queries", len(request.queries))
+        span.set_attribute("num_documents", len(request.documents))
+
+        log.info(
+            "Rerank batch request",
+            extra={
+                "num_queries": len(request.queries),
+                "num_documents": len(request.documents),
+                "model": request.model,
+                "fusion": request.fusion,
+            },
+        )
+
+        try:
+            if not request.documents or not request.queries:
+                return RerankBatchResponse(
+                    model=request.model,
+                    rankings=[
+                        RerankQueryResult(query=query, results=[])
+                        for query in request.queries
+                    ],
+                    fused=[] if request.fusion else None,
+                )
+
+            provider = get_embedding_provider("jina")
+            texts = [doc.text for doc in request.documents]
+            unique_queries = list(dict.fromkeys(request.queries))
+            semaphore = asyncio.Semaphore(max(1, settings.rerank_batch_concurrency))
+
+            async def score_query(query: str):
+                async with semaphore:
+                    return await score_documents(provider, query, texts, request.model)
+
+            scored = await asyncio.gather(*(score_query(q) for q in unique_queries))
+            full_rankings = {
+                query: rank_scores(scores)
+                for query, (scores, _) in zip(unique_queries, scored)
+            }
+            response_model = scored[0][1]
+
+            def to_results(ranked: List[Tuple[int, float]]) -> List[RerankResult]:
+                return [
+                    RerankResult(
+                        index=index,
+                        relevance_score=score,
+                        document=request.documents[index],
+                    )
+                    for index, score in ranked
+                ]
+
+            rankings = [
+                RerankQueryResult(
+                    query=query,
+                    results=to_results(full_rankings[query][: request.top_n]),
+                )
+                for query in request.queries
+            ]
+
+            fused = None
+            if request.fusion == "rrf":
+                fused_scores = reciprocal_rank_fusion(
+                    list(full_rankings.values()), k=request.rrf_k
+                )
+                fused = to_results(rank_scores(fused_scores, request.top_n))
+
+            log.info(
+                "Rerank batch success",
+                extra={
+                    "num_queries": len(unique_queries),
+                    "num_documents": len(texts),
+                },
+            )
+
+            return RerankBatchResponse(
+                model=response_model, rankings=rankings, fused=fused
+            )
+
+        except Exception as e:
+            log.error(
+                "Rerank batch error",
+                extra={"error": str(e), "error_type": type(e).__name__},
+            )
+            span.set_attribute("error", True)
+            span.record_exception(e)
+            raise HTTPException(
+                status_code=500, detail=f"Failed to rerank documents: {str(e)}"
+            )
+
+
+@router.get("/v1/rerank/cache/stats")
+async def get_rerank_cache_stats():
+    """Hit/miss/eviction counters for the rerank score cache."""
+    return {
+        **rerank_cache.get_stats(),
+        "single_flight": single_flight.get_stats("rerank"),
+    }
@@ -0,0 +1,17 @@
+from pathlib import Path
+
+from .router import ModelRouter
+from .stats import ModelStats
+from ..config import settings
+
+# Shared instances that can be imported by the providers and routes
+model_stats = ModelStats(alpha=settings.routing_ewma_alpha)
+
+model_router = ModelRouter(
+    model_stats,
+    Path(__file__).parent.parent / "config" / "chat_routing.yaml",
+    exploration_rate=settings.routing_exploration_rate,
+    prior_ttft=settings.routing_prior_ttft_seconds,
+    prior_tokens_per_second=settings.routing_prior_tokens_per_second,
+    reference_tokens=settings.routing_reference_tokens,
+)
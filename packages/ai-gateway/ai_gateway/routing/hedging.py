@@ -0,0 +1,190 @@
+import asyncio
+import logging
+from statistics import NormalDist
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+
+from .stats import ModelHealth
+
+log = logging.getLogger(__name__)
+
+# Marks a stream that finished before yielding anything.
+STREAM_END = object()
+
+
+class HedgePolicy:
+    """
+    Per-prompt hedging policy from the prompt YAML:
+
+        meta:
+          hedge:
+            quantile: 0.9        # fire the backup after this TTFT quantile
+            min_delay_ms: 250
+            max_delay_ms: 4000
+            default_delay_ms: 1500   # used until the model has samples
+
+    Applied by the auto provider only: it records the per-model statistics
+    the delay is derived from and can race a different candidate.
+    """
+
+    def __init__(
+        self,
+        quantile: float = 0.9,
+        min_delay_ms: float = 250.0,
+        max_delay_ms: float = 4000.0,
+        default_delay_ms: float = 1500.0,
+    ):
+        self.quantile = min(max(quantile, 0.5), 0.999)
+        self.min_delay = min_delay_ms / 1000.0
+        self.max_delay = max_delay_ms / 1000.0
+        self.default_delay = default_delay_ms / 1000.0
+
+    @classmethod
+    def from_meta(cls, meta: Dict[str, Any]) -> Optional["HedgePolicy"]:
+        config = meta.get("hedge")
+        if config is True:
+            return cls()
+        if not isinstance(config, dict) or config.get("enabled") is False:
+            return None
+        return cls(
+            quantile=float(config.get("quantile", 0.9)),
+            min_delay_ms=float(config.get("min_delay_ms", 250.0)),
+            max_delay_ms=float(config.get("max_delay_ms", 4000.0)),
+            default_delay_ms=float(config.get("default_delay_ms", 1500.0)),
+        )
+
+    def delay(self, health: Optional[ModelHealth], streaming: bool) -> float:
+        """
+        Seconds to wait for the primary's first token (or, for non-streaming
+        calls, its full response) before sending the backup: the configured
+        quantile of a normal fit to the model's EWMA mean and variance.
+        """
+        signal = None
+        if health is not None:
+            signal = health.ttft if streaming else health.latency
+        if signal is None or signal.mean is None or signal.count < 2:
+            delay = self.default_delay
+        else:
+            delay = signal.mean + NormalDist().inv_cdf(self.quantile) * signal.std
+        return min(max(delay, self.min_delay), self.max_delay)
+
+
+async def _cancel(tasks) -> None:
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def hedged_call(
+    attempts: List[Callable[[], Awaitable[Any]]], delay: float
+) -> Tuple[int, Any]:
+    """
+    Starts attempts[0]; if it has not completed after `delay` seconds (or
+    fails earlier), starts the next attempt. Returns (winning attempt index,
+    result) for the first attempt to succeed and cancels the others. Raises
+    the last error when every attempt fails.
+    """
+    pending: Dict[asyncio.Task, int] = {}
+    next_attempt = 0
+    last_error: Optional[BaseException] = None
+
+    def launch() -> None:
+        nonlocal next_attempt
+        pending[asyncio.ensure_future(attempts[next_attempt]())] = next_attempt
+        next_attempt += 1
+
+    launch()
+    try:
+        while pending:
+            timeout = delay if next_attempt < len(attempts) else None
+            done, _ = await asyncio.wait(
+                pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                log.info("Hedging: sending backup request", extra={"delay": delay})
+                launch()
+                continue
+            for task in done:
+                index = pending.pop(task)
+                if task.exception() is None:
+                    return index, task.result()
+                last_error = task.exception()
+                log.warning(
+                    "Hedged attempt failed",
+                    extra={"attempt": index, "error": str(last_error)},
+                )
+            if not pending and next_attempt < len(attempts):
+                launch()
+        raise last_error
+    finally:
+        await _cancel(list(pending))
+
+
+async def hedged_stream(
+    attempts: List[Callable[[], AsyncIterator[Any]]], delay: float
+) -> Tuple[int, AsyncIterator[Any], Any]:
+    """
+    Streaming variant of `hedged_call`: races the attempts to their first
+    chunk. Returns (winning attempt index, its iterator, first chunk or
+    STREAM_END); the caller keeps consuming the winner. Losing streams are
+    cancelled and closed.
+    """
+    streams: Dict[asyncio.Task, Tuple[int, AsyncIterator[Any]]] = {}
+    next_attempt = 0
+    last_error: Optional[BaseException] = None
+    winner: Optional[AsyncIterator[Any]] = None
+
+    def launch() -> None:
+        nonlocal next_attempt
+        iterator = attempts[next_attempt]().__aiter__()
+        streams[asyncio.ensure_future(iterator.__anext__())] = (next_attempt, iterator)
+        next_attempt += 1
+
+    launch()
+    try:
+        while streams:
+            timeout = delay if next_attempt < len(attempts) else None
+            done, _ = await asyncio.wait(
+                streams, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                log.info("Hedging: sending backup stream", extra={"delay": delay})
+                launch()
+                continue
+            for task in done:
+                index, iterator = streams.pop(task)
+                error = task.exception()
+                if error is None or isinstance(error, StopAsyncIteration):
+                    winner = iterator
+                    first = STREAM_END if error is not None else task.result()
+                    return index, iterator, first
+                last_error = error
+                log.warning(
+                    "Hedged stream failed",
+                    extra={"attempt": index, "error": str(error)},
+                )
+            if not streams and next_attempt < len(attempts):
+                launch()
+        raise last_error
+    finally:
+        losers = [
+            (task, iterator)
+            for task, (_, iterator) in streams.items()
+            if iterator is not winner
+        ]
+        await _cancel([task for task, _ in losers])
+        for _, iterator in losers:
+            aclose = getattr(iterator, "aclose", None)
+            if aclose is not None:
+                try:
+                    await aclose()
+                except Exception:
+                    pass
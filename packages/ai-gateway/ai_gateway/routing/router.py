@@ -0,0 +1,108 @@
+import logging
+import random
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import yaml
+
+from .stats import ModelKey, ModelStats
+
+log = logging.getLogger(__name__)
+
+
+class ModelRouter:
+    """
+    Chooses a (provider, model) for a complexity tier from the candidates in
+    chat_routing.yaml. Each candidate is scored by its expected latency for
+    a reference-length answer (EWMA TTFT + tokens / EWMA tokens-per-second),
+    inflated by its recent error and 429 rates. Candidates without samples
+    use optimistic priors so they get tried, and a small exploration budget
+    keeps statistics for the non-preferred models fresh.
+    """
+
+    def __init__(
+        self,
+        stats: ModelStats,
+        config_path: Path,
+        exploration_rate: float = 0.05,
+        prior_ttft: float = 1.0,
+        prior_tokens_per_second: float = 50.0,
+        reference_tokens: int = 256,
+        error_penalty: float = 10.0,
+        rate_limit_penalty: float = 20.0,
+    ):
+        self.stats = stats
+        self.exploration_rate = exploration_rate
+        self.prior_ttft = prior_ttft
+        self.prior_tokens_per_second = prior_tokens_per_second
+        self.reference_tokens = reference_tokens
+        self.error_penalty = error_penalty
+        self.rate_limit_penalty = rate_limit_penalty
+        self._random = random.Random()
+        self.tiers: Dict[str, List[ModelKey]] = self._load(config_path)
+
+    @staticmethod
+    def _load(config_path: Path) -> Dict[str, List[ModelKey]]:
+        try:
+            with open(config_path, "r") as f:
+                config = yaml.safe_load(f) or {}
+        except FileNotFoundError:
+            log.warning(f"Chat routing configuration not found: {config_path}")
+            return {}
+        except yaml.YAMLError as e:
+            log.error(f"Error parsing chat routing configuration: {e}")
+            return {}
+
+        tiers = {
+            tier: [(c["provider"], c["model"]) for c in candidates or []]
+            for tier, candidates in (config.get("tiers") or {}).items()
+        }
+        log.info(
+            f"Loaded chat routing for {len(tiers)} tiers from {config_path}",
+            extra={"tiers": sorted(tiers)},
+        )
+        return tiers
+
+    def candidates(self, tier: str) -> List[ModelKey]:
+        return self.tiers.get(tier) or self.tiers.get("default") or []
+
+    def expected_latency(self, provider: str, model: str) -> float:
+        health = self.stats.peek(provider, model)
+        if health is None:
+            return self.prior_ttft + self.reference_tokens / self.prior_tokens_per_second
+        ttft = health.ttft.mean if health.ttft.mean is not None else self.prior_ttft
+        tps = health.tokens_per_second.mean or self.prior_tokens_per_second
+        latency = ttft + self.reference_tokens / tps
+        penalty = (
+            1.0
+            + self.error_penalty * (health.error_rate.mean or 0.0)
+            + self.rate_limit_penalty * (health.rate_limit_rate.mean or 0.0)
+        )
+        return latency * penalty
+
+    def rank(self, tier: str) -> List[ModelKey]:
+        """Candidates for `tier`, best first (config order breaks ties)."""
+        return sorted(
+            self.candidates(tier), key=lambda key: self.expected_latency(*key)
+        )
+
+    def choose(self, tier: str) -> Optional[ModelKey]:
+        ranked = self.rank(tier)
+        if not ranked:
+            return None
+        if len(ranked) > 1 and self._random.random() < self.exploration_rate:
+            return self._random.choice(ranked[1:])
+        return ranked[0]
+
+    def snapshot(self) -> Dict[str, List[Dict[str, object]]]:
+        return {
+            tier: [
+                {
+                    "provider": provider,
+                    "model": model,
+                    "expected_latency_seconds": self.expected_latency(provider, model),
+                }
+                for provider, model in self.rank(tier)
+            ]
+            for tier in self.tiers
+        }
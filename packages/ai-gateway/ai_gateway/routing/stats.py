@@ -0,0 +1,123 @@
+import math
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+ModelKey = Tuple[str, str]
+
+
+class _EWMA:
+    """Exponentially weighted mean and variance of one signal."""
+
+    __slots__ = ("alpha", "mean", "var", "count")
+
+    def __init__(self, alpha: float):
+        self.alpha = alpha
+        self.mean: Optional[float] = None
+        self.var = 0.0
+        self.count = 0
+
+    def update(self, value: float) -> None:
+        self.count += 1
+        if self.mean is None:
+            self.mean = value
+            return
+        diff = value - self.mean
+        increment = self.alpha * diff
+        self.mean += increment
+        self.var = (1.0 - self.alpha) * (self.var + diff * increment)
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.var)
+
+
+class ModelHealth:
+    """Rolling health signals for one (provider, model)."""
+
+    def __init__(self, alpha: float):
+        self.ttft = _EWMA(alpha)
+        # End-to-end latency of non-streaming calls.
+        self.latency = _EWMA(alpha)
+        self.tokens_per_second = _EWMA(alpha)
+        self.error_rate = _EWMA(alpha)
+        self.rate_limit_rate = _EWMA(alpha)
+        self.requests = 0
+        self.last_update: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "ttft_seconds": self.ttft.mean,
+            "ttft_std_seconds": self.ttft.std if self.ttft.count else None,
+            "latency_seconds": self.latency.mean,
+            "latency_std_seconds": self.latency.std if self.latency.count else None,
+            "tokens_per_second": self.tokens_per_second.mean,
+            "error_rate": self.error_rate.mean or 0.0,
+            "rate_limit_rate": self.rate_limit_rate.mean or 0.0,
+            "last_update": self.last_update,
+        }
+
+
+class ModelStats:
+    """
+    EWMA statistics per (provider, model), fed by the auto provider after
+    every upstream call: time-to-first-token and tokens/sec on success,
+    error and 429 rates on every outcome.
+    """
+
+    def __init__(self, alpha: float = 0.2):
+        self.alpha = alpha
+        self._health: Dict[ModelKey, ModelHealth] = {}
+        self._lock = threading.Lock()
+
+    def get(self, provider: str, model: str) -> ModelHealth:
+        key = (provider, model)
+        with self._lock:
+            health = self._health.get(key)
+            if health is None:
+                health = ModelHealth(self.alpha)
+                self._health[key] = health
+            return health
+
+    def peek(self, provider: str, model: str) -> Optional[ModelHealth]:
+        """Health for a model that has been observed, without creating it."""
+        with self._lock:
+            return self._health.get((provider, model))
+
+    def record_success(
+        self,
+        provider: str,
+        model: str,
+        ttft: Optional[float] = None,
+        latency: Optional[float] = None,
+        tokens: Optional[int] = None,
+        generation_seconds: Optional[float] = None,
+    ) -> None:
+        health = self.get(provider, model)
+        with self._lock:
+            health.requests += 1
+            health.last_update = time.time()
+            health.error_rate.update(0.0)
+            health.rate_limit_rate.update(0.0)
+            if ttft is not None:
+                health.ttft.update(ttft)
+            if latency is not None:
+                health.latency.update(latency)
+            if tokens and generation_seconds and generation_seconds > 0:
+                health.tokens_per_second.update(tokens / generation_seconds)
+
+    def record_error(self, provider: str, model: str, rate_limited: bool) -> None:
+        health = self.get(provider, model)
+        with self._lock:
+            health.requests += 1
+            health.last_update = time.time()
+            health.error_rate.update(1.0)
+            health.rate_limit_rate.update(1.0 if rate_limited else 0.0)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                f"{provider}/{model}": health.to_dict()
+                for (provider, model), health in self._health.items()
+            }
@@ -66,6 +66,17 @@ class ChatCompletionRequest(BaseModel):
     )
     reasoning: Optional[Union[ReasoningConfig, bool]] = None
 
+    # Response cache: None caches only deterministic requests (temperature 0),
+    # True always caches, False bypasses the cache.
+    cache: Optional[bool] = None
+
+    # Coalesce streamed content into one SSE event per N ms (server default if unset).
+    stream_coalesce_ms: Optional[float] = None
+
+    # Replace older `messages` with a cached rolling summary once the
+    # history exceeds the server's compaction threshold.
+    compact_history: bool = False
+
     @model_validator(mode="before")
     @classmethod
     def set_provider_and_validate_model(cls, values: Dict[str, Any]) -> Dict[str, Any]:
@@ -96,6 +107,28 @@ class ChatCompletionResponse(BaseModel):
     model: str
     choices: List[Dict[str, Any]]
     usage: Dict[str, int]
+    # Prompt token counts before and after context budgeting.
+    context: Optional[Dict[str, Any]] = None
+
+
+class ChatCompletionBatchRequest(BaseModel):
+    requests: List[ChatCompletionRequest]
+
+
+class ChatCompletionBatchError(BaseModel):
+    status_code: int
+    detail: Any
+
+
+class ChatCompletionBatchItem(BaseModel):
+    index: int
+    response: Optional[ChatCompletionResponse] = None
+    error: Optional[ChatCompletionBatchError] = None
+
+
+class ChatCompletionBatchResponse(BaseModel):
+    object: str = "list"
+    results: List[ChatCompletionBatchItem]
 
 
 # --- Embeddings ---
@@ -107,6 +140,14 @@ class EmbeddingRequest(BaseModel):
     fullModel: Optional[str] = None  # Format: timestamp@version@provider/model
     input: Union[str, List[str]]
     options: Dict[str, Any] = Field(default_factory=dict)
+    # "float" returns JSON lists, "base64" returns little-endian float32 strings
+    # and "binary" returns a single application/octet-stream vector frame.
+    encoding_format: Literal["float", "base64", "binary"] = "float"
+    # Server-side quantization applied before encoding. int8 responses
+    # include the scale/offset needed to dequantize.
+    quantization: Optional[Literal["float16", "int8", "binary"]] = None
+    # Matryoshka output size. Must be listed in the model's supportedDimensions.
+    dimensions: Optional[int] = None
 
 
 class EmbeddingResponse(BaseModel):
@@ -115,6 +156,7 @@ class EmbeddingResponse(BaseModel):
     provider: str
     model: str
     usage: Dict[str, int]
+    quantization: Optional[Dict[str, Any]] = None
 
 
 class SetDefaultModelRequest(BaseModel):
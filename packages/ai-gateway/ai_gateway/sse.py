@@ -0,0 +1,147 @@
+import asyncio
+import json
+import time
+from typing import Any, AsyncGenerator, AsyncIterator, Dict, List, Optional
+
+try:
+    import orjson
+
+    def dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+except ImportError:
+    orjson = None
+
+    def dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode(
+            "utf-8"
+        )
+
+
+SSE_DONE = b"data: [DONE]\n\n"
+
+
+def safe_dumps(obj: Any) -> bytes:
+    """`dumps` with an ASCII-escaped fallback for lone surrogates."""
+    try:
+        return dumps(obj)
+    except (TypeError, ValueError, UnicodeEncodeError):
+        return json.dumps(obj, ensure_ascii=True, separators=(",", ":")).encode(
+            "ascii"
+        )
+
+
+class SSEChunkEncoder:
+    """
+    Encodes chat.completion.chunk events for one completion. The envelope
+    (id, object, created, model) is serialized once; each event only
+    serializes its delta and splices it between the cached prefix and suffix.
+    """
+
+    def __init__(self, completion_id: str, created: int, model: Optional[str]):
+        envelope = safe_dumps(
+            {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+            }
+        )
+        self._prefix = b"data: " + envelope[:-1] + b',"choices":[{"index":0,"delta":'
+        self._suffix = b',"finish_reason":null}]}\n\n'
+        self._content_prefix = self._prefix + b'{"content":'
+
+    def encode(
+        self, delta: Dict[str, Any], finish_reason: Optional[str] = None
+    ) -> bytes:
+        if finish_reason is None:
+            return self._prefix + safe_dumps(delta) + self._suffix
+        return (
+            self._prefix
+            + safe_dumps(delta)
+            + b',"finish_reason":'
+            + safe_dumps(finish_reason)
+            + b"}]}\n\n"
+        )
+
+    def encode_content(self, content: str) -> bytes:
+        """Fast path for the common content-only delta."""
+        return self._content_prefix + safe_dumps(content) + b"}" + self._suffix
+
+
+class StreamMeter:
+    """
+    Per-stream counters: upstream deltas received (before coalescing) and
+    the CPU time spent coalescing and encoding them, excluding upstream waits.
+    """
+
+    def __init__(self):
+        self.deltas = 0
+        self.cpu_seconds = 0.0
+
+
+async def coalesce_deltas(
+    chunks: AsyncIterator[Dict[str, Any]],
+    window_ms: float,
+    meter: Optional[StreamMeter] = None,
+) -> AsyncGenerator[Dict[str, Any], None]:
+    """
+    Merges consecutive content-only deltas that arrive within `window_ms` of
+    the first buffered one into a single delta. Any other chunk (role, tool
+    calls, finish reason) flushes the buffer and passes through unchanged,
+    so ordering is preserved. When a `meter` is given, every upstream delta
+    and the CPU spent merging them are recorded on it.
+    """
+    loop = asyncio.get_running_loop()
+    window = window_ms / 1000.0
+    iterator = chunks.__aiter__()
+    buffered: List[str] = []
+    deadline: Optional[float] = None
+    next_chunk: Optional[asyncio.Future] = None
+
+    try:
+        while True:
+            if next_chunk is None:
+                next_chunk = asyncio.ensure_future(iterator.__anext__())
+            timeout = None if deadline is None else max(0.0, deadline - loop.time())
+            done, _ = await asyncio.wait({next_chunk}, timeout=timeout)
+
+            started = time.thread_time()
+            ready: List[Dict[str, Any]] = []
+            if not done:
+                # Window elapsed while waiting for upstream: flush what we have.
+                ready.append({"content": "".join(buffered)})
+                buffered, deadline = [], None
+            else:
+                try:
+                    chunk = next_chunk.result()
+                except StopAsyncIteration:
+                    break
+                finally:
+                    next_chunk = None
+
+                if meter is not None and "usage" not in chunk:
+                    meter.deltas += 1
+                if chunk.keys() == {"content"}:
+                    buffered.append(chunk["content"])
+                    if deadline is None:
+                        deadline = loop.time() + window
+                    elif loop.time() >= deadline:
+                        ready.append({"content": "".join(buffered)})
+                        buffered, deadline = [], None
+                else:
+                    if buffered:
+                        ready.append({"content": "".join(buffered)})
+                        buffered, deadline = [], None
+                    ready.append(chunk)
+            if meter is not None:
+                meter.cpu_seconds += time.thread_time() - started
+
+            for out in ready:
+                yield out
+
+        if buffered:
+            yield {"content": "".join(buffered)}
+    finally:
+        if next_chunk is not None and not next_chunk.done():
+            next_chunk.cancel()
@@ -0,0 +1,147 @@
+import math
+import struct
+import sys
+from array import array
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Binary vector frame (application/octet-stream responses):
+#
+#   offset  size  field
+#   0       4     magic b"FYLV"
+#   4       1     format version (1)
+#   5       1     dtype code (see DTYPE_*)
+#   6       2     reserved
+#   8       4     row count
+#   12      4     dimensions per row
+#   16      ...   row-major little-endian values, rows ordered by input index
+#
+# Binary (sign) rows are bit-packed MSB-first, ceil(dimensions / 8) bytes each.
+VECTOR_FRAME_MAGIC = b"FYLV"
+VECTOR_FRAME_VERSION = 1
+VECTOR_FRAME_HEADER = struct.Struct("<4sBBHII")
+VECTOR_FRAME_MEDIA_TYPE = "application/octet-stream"
+
+DTYPE_FLOAT32 = 0
+DTYPE_FLOAT16 = 1
+DTYPE_INT8 = 2
+DTYPE_BINARY = 3
+
+QUANTIZATION_DTYPES = {
+    None: DTYPE_FLOAT32,
+    "float16": DTYPE_FLOAT16,
+    "int8": DTYPE_INT8,
+    "binary": DTYPE_BINARY,
+}
+
+
+def pack_float32(vector: Sequence[float]) -> bytes:
+    """Pack a vector as little-endian float32 bytes."""
+    packed = array("f", vector)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def pack_float16(vector: Sequence[float]) -> bytes:
+    """Pack a vector as little-endian IEEE half-precision bytes."""
+    return struct.pack(f"<{len(vector)}e", *vector)
+
+
+def int8_calibration(
+    vectors: List[Sequence[float]], calibration: Optional[Dict[str, Any]] = None
+) -> Tuple[float, float]:
+    """
+    Return (scale, offset) mapping [min, max] onto the 256 int8 levels.
+    Uses the model's stored calibration range when available, otherwise
+    the observed range of `vectors`.
+    """
+    if calibration and "min" in calibration and "max" in calibration:
+        low, high = float(calibration["min"]), float(calibration["max"])
+    else:
+        low = min((min(v) for v in vectors if len(v)), default=-1.0)
+        high = max((max(v) for v in vectors if len(v)), default=1.0)
+    if high <= low:
+        high = low + 1e-6
+    return (high - low) / 255.0, low
+
+
+def quantize_int8(vector: Sequence[float], scale: float, offset: float) -> bytes:
+    """
+    Scalar-quantize to int8: q = round((x - offset) / scale) - 128, clamped.
+    Dequantize with x ~= (q + 128) * scale + offset.
+    """
+    return array(
+        "b",
+        (max(-128, min(127, round((x - offset) / scale) - 128)) for x in vector),
+    ).tobytes()
+
+
+def pack_bits(vector: Sequence[float]) -> bytes:
+    """Sign-binarize (x > 0 -> 1) and pack MSB-first, zero-padded to a byte."""
+    if not vector:
+        return b""
+    byte_count = (len(vector) + 7) // 8
+    bits = "".join("1" if x > 0 else "0" for x in vector).ljust(byte_count * 8, "0")
+    return int(bits, 2).to_bytes(byte_count, "big")
+
+
+def quantize_vectors(
+    vectors: List[Sequence[float]],
+    quantization: Optional[str],
+    calibration: Optional[Dict[str, Any]] = None,
+) -> Tuple[List[bytes], Optional[Dict[str, Any]]]:
+    """
+    Pack every vector into the raw bytes of the requested quantization.
+    Returns (rows, parameters) where parameters describe how to decode,
+    e.g. {"type": "int8", "scale": ..., "offset": ...}.
+    """
+    if quantization is None:
+        return [pack_float32(v) for v in vectors], None
+    if quantization == "float16":
+        return [pack_float16(v) for v in vectors], {"type": "float16"}
+    if quantization == "int8":
+        scale, offset = int8_calibration(vectors, calibration)
+        rows = [quantize_int8(v, scale, offset) for v in vectors]
+        return rows, {"type": "int8", "scale": scale, "offset": offset}
+    if quantization == "binary":
+        return [pack_bits(v) for v in vectors], {"type": "binary"}
+    raise ValueError(f"Unsupported quantization: {quantization}")
+
+
+def unpack_row(row: bytes, quantization: Optional[str]) -> List[Any]:
+    """Turn packed row bytes back into a JSON-friendly list."""
+    if quantization is None:
+        values = array("f")
+        values.frombytes(row)
+        if sys.byteorder == "big":
+            values.byteswap()
+        return values.tolist()
+    if quantization == "float16":
+        return list(struct.unpack(f"<{len(row) // 2}e", row))
+    if quantization == "int8":
+        return array("b", row).tolist()
+    # Bit-packed rows are returned as their unsigned byte values.
+    return list(row)
+
+
+def truncate_and_normalize(vector: Sequence[float], dimensions: int) -> List[float]:
+    """Keep the first `dimensions` components (Matryoshka prefix) and L2-renormalize."""
+    prefix = list(vector[:dimensions])
+    norm = math.sqrt(sum(x * x for x in prefix))
+    if norm:
+        prefix = [x / norm for x in prefix]
+    return prefix
+
+
+def encode_frame(
+    rows: List[bytes], dimensions: int, dtype: int = DTYPE_FLOAT32
+) -> bytes:
+    """Encode already packed, equally sized rows into a single binary frame."""
+    row_size = len(rows[0]) if rows else 0
+    for i, row in enumerate(rows):
+        if len(row) != row_size:
+            raise ValueError(f"Row {i} is {len(row)} bytes, expected {row_size}")
+    header = VECTOR_FRAME_HEADER.pack(
+        VECTOR_FRAME_MAGIC, VECTOR_FRAME_VERSION, dtype, 0, len(rows), dimensions
+    )
+    return header + b"".join(rows)
@@ -12,6 +12,12 @@ class Settings(BaseSettings):
     db_name: str = None
 
     ai_gateway_url: str = "http://localhost:8000"
+    # Chat batches: the gateway rejects batches above its
+    # chat_batch_max_requests and runs chat_batch_provider_concurrency items
+    # at a time, so each chunk's timeout is sized from both.
+    ai_gateway_batch_max_requests: int = 64
+    ai_gateway_batch_concurrency: int = 8
+    ai_gateway_request_timeout: float = 120.0
 
     s3_endpoint: Optional[str] = None
     s3_port: Optional[str] = None
@@ -122,33 +122,37 @@ class PodcastGenerator(BaseGenerator, DatabaseHelper, VectorHelper):
         """Processes vector groups to generate high-level segment summaries."""
         summaries = []
         total_groups = len(groups)
-        for i, group in enumerate(groups):
-            self._publish_status(
-                channel,
-                podcast_id,
-                {
-                    "stage": "summarizing_segments",
-                    "message": f"Summarizing content segment {i + 1} of {total_groups}...",
+        self._publish_status(
+            channel,
+            podcast_id,
+            {
+                "stage": "summarizing_segments",
+                "message": f"Summarizing {total_groups} content segments...",
+            },
+            "podcast",
+        )
+        payloads = [
+            {
+                "prompt_type": "podcast_segment",
+                "prompt_version": "v1",
+                "prompt_vars": {
+                    "content_snippets": "\n\n---\n\n".join(
+                        [vector.content for vector in group[:15]]
+                    )
                 },
-                "podcast",
-            )
-            content_snippets = "\n\n---\n\n".join(
-                [vector.content for vector in group[:15]]
-            )
+            }
+            for group in groups
+        ]
+        # Failed items (or chunks) come back as None; the rest are kept.
+        responses = ai_gateway_service.generate_text_batch(payloads)
+
+        for i, response_str in enumerate(responses):
+            if response_str is None:
+                continue
             try:
-                response_str = ai_gateway_service.generate_text(
-                    {
-                        "prompt_type": "podcast_segment",
-                        "prompt_version": "v1",
-                        "prompt_vars": {"content_snippets": content_snippets},
-                    }
-                )
-                segment_data = json.loads(response_str)
-                summaries.append(segment_data)
-            except (json.JSONDecodeError, Exception) as e:
-                log.error(
-                    f"Failed to generate or parse segment summary for group {i}: {e}"
-                )
+                summaries.append(json.loads(response_str))
+            except json.JSONDecodeError as e:
+                log.error(f"Failed to parse segment summary for group {i}: {e}")
         return summaries
 
     def _generate_final_script(
@@ -1,16 +1,25 @@
 import httpx
 import logging
-from typing import Dict, Any, List, Union
+import math
+import struct
+import numpy as np
+from typing import Dict, Any, List, Optional, Union
 
 from ..config import settings
 
 log = logging.getLogger(__name__)
 
+# Header of the gateway's binary vector frame:
+# magic, version, dtype, reserved, row count, dimensions.
+EMBEDDING_FRAME_HEADER = struct.Struct("<4sBBHII")
+
 
 class AIGatewayService:
     def __init__(self):
         self.base_url = settings.ai_gateway_url
-        self.client = httpx.Client(base_url=self.base_url, timeout=120.0)
+        self.client = httpx.Client(
+            base_url=self.base_url, timeout=settings.ai_gateway_request_timeout
+        )
         log.info(
             f"AI Gateway Service initialized for URL: {self.base_url}",
             extra={"method": "__init__"},
@@ -24,19 +33,24 @@ class AIGatewayService:
             "model": model,
             "input": [text],
             "options": {"task": "retrieval.query"},
+            "encoding_format": "binary",
         }
         try:
-            response = self.client.post("/v1/embeddings", json=request_payload)
+            response = self.client.post(
+                "/v1/embeddings",
+                json=request_payload,
+                headers={"Accept": "application/octet-stream"},
+            )
             response.raise_for_status()
-            data = response.json()
-            if (
-                "data" not in data
-                or not isinstance(data["data"], list)
-                or not data["data"]
-                or "embedding" not in data["data"][0]
-            ):
+            content = response.content
+            if len(content) < EMBEDDING_FRAME_HEADER.size:
                 raise ValueError("Invalid embedding response structure from AI Gateway")
-            return data["data"][0]["embedding"]
+            magic, _, dtype, _, count, dims = EMBEDDING_FRAME_HEADER.unpack_from(content)
+            if magic != b"FYLV" or dtype != 0 or count < 1:
+                raise ValueError("Invalid embedding response structure from AI Gateway")
+            return np.frombuffer(
+                content, dtype="<f4", count=dims, offset=EMBEDDING_FRAME_HEADER.size
+            ).tolist()
         except httpx.HTTPStatusError as e:
             log.error(
                 f"HTTP error calling AI Gateway for embeddings: {e.response.status_code} - {e.response.text}"
@@ -73,6 +87,57 @@ class AIGatewayService:
             log.error(f"An unexpected error occurred while calling AI Gateway: {e}")
             raise
 
+    def generate_text_batch(
+        self, payloads: List[Dict[str, Any]]
+    ) -> List[Optional[str]]:
+        """
+        Runs several independent completions through the gateway's batch
+        endpoint, in chunks of at most `ai_gateway_batch_max_requests`.
+        Returns the content per payload, in order, or None for items that
+        failed, including every item of a chunk whose call failed.
+        """
+        contents: List[Optional[str]] = [None] * len(payloads)
+        chunk_size = max(1, settings.ai_gateway_batch_max_requests)
+        for start in range(0, len(payloads), chunk_size):
+            chunk = payloads[start : start + chunk_size]
+            for item in self._post_text_batch(chunk):
+                if item.get("error"):
+                    log.error(
+                        f"Batch item {start + item.get('index', 0)} failed: {item['error'].get('detail')}"
+                    )
+                    continue
+                contents[start + item["index"]] = (
+                    item.get("response", {})
+                    .get("choices", [{}])[0]
+                    .get("message", {})
+                    .get("content", "")
+                )
+        return contents
+
+    def _post_text_batch(self, payloads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """One batch call; its timeout covers every round of the gateway's concurrency."""
+        rounds = math.ceil(len(payloads) / max(1, settings.ai_gateway_batch_concurrency))
+        request_payload = {
+            "requests": [
+                {"provider": "auto", "stream": False, **payload} for payload in payloads
+            ]
+        }
+        try:
+            response = self.client.post(
+                "/v1/chat/completions/batch",
+                json=request_payload,
+                timeout=settings.ai_gateway_request_timeout * rounds,
+            )
+            response.raise_for_status()
+            return response.json().get("results", [])
+        except httpx.HTTPStatusError as e:
+            log.error(
+                f"HTTP error calling AI Gateway batch: {e.response.status_code} - {e.response.text}"
+            )
+        except Exception as e:
+            log.error(f"An unexpected error occurred while calling AI Gateway batch: {e}")
+        return []
+
     def generate_tts(
         self,
         text: str,
@@ -2,7 +2,9 @@ import os
 import pika
 import sys
 import json
+import struct
 import requests
+import numpy as np
 from datetime import datetime
 from dotenv import load_dotenv
 import logging
@@ -58,14 +60,38 @@ def publish_status(channel, job_key, stage, message, error=False):
     )
 
 
-def get_embeddings(chunks: list[str], embedding_model: str) -> list[list[float]]:
-    """Calls the AI Gateway passing the full model string as-is."""
+# Header of the gateway's binary vector frame:
+# magic, version, dtype, reserved, row count, dimensions.
+EMBEDDING_FRAME_HEADER = struct.Struct("<4sBBHII")
+
+
+def get_embeddings(chunks: list[str], embedding_model: str) -> np.ndarray:
+    """
+    Calls the AI Gateway passing the full model string as-is.
+    Vectors are requested as a raw float32 frame to skip JSON float parsing.
+    """
     response = requests.post(
         f"{AI_GATEWAY_URL}/v1/embeddings",
-        json={"fullModel": embedding_model, "input": chunks, "options": {}},
+        json={
+            "fullModel": embedding_model,
+            "input": chunks,
+            "options": {},
+            "encoding_format": "binary",
+        },
+        headers={"Accept": "application/octet-stream"},
     )
     response.raise_for_status()
-    return [item["embedding"] for item in response.json()["data"]]
+    magic, _, dtype, _, count, dims = EMBEDDING_FRAME_HEADER.unpack_from(
+        response.content
+    )
+    if magic != b"FYLV" or dtype != 0:
+        raise ValueError("Unexpected embedding frame from AI Gateway")
+    return np.frombuffer(
+        response.content,
+        dtype="<f4",
+        count=count * dims,
+        offset=EMBEDDING_FRAME_HEADER.size,
+    ).reshape(count, dims)
 
 
 def main():